@@ -0,0 +1,179 @@
+"""Optional columnar archive of page views (DuckDB, one file per month).
+
+Long-range questions (all-time totals, this year vs last year) should not
+require keeping every raw row in the main database. When
+``ANALYTICS_ARCHIVE_DIR`` is set and the optional ``duckdb`` package is
+installed (``requirements/analytics.txt``), ``manage.py archive_pageviews``
+appends each closed day of page views to ``pageviews-YYYY-MM.duckdb`` in that
+directory. ``prune_pageviews`` can then keep only the recent window.
+
+Each month file holds the raw rows (``pageviews``, same columns as the CSV
+export plus ``day``) for ad-hoc analysis, and one row per archived day in
+``archived_days`` with its view count. The dashboard cards only read the
+latter, so they cost a few tiny queries however much history is kept.
+Figures combine the archive (up to ``archived_through()``) with the main
+database (after it), so a day is never counted twice, and are cached for
+``CACHE_TTL`` seconds.
+
+Without the setting or the package every helper reports the archive as
+disabled and the dashboard falls back to the main database alone.
+"""
+
+import logging
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.analytics.export import FIELDS, date_range, write_archive
+from apps.analytics.models import PageView, view_total
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "analytics:columnar"
+CACHE_TTL = 60 * 60
+
+# DuckDB types of the exported CSV columns, in ``FIELDS`` order.
+COLUMN_TYPES = {
+    "id": "BIGINT",
+    "created_at": "TIMESTAMPTZ",
+    "path": "VARCHAR",
+    "referrer": "VARCHAR",
+    "utm_source": "VARCHAR",
+    "utm_medium": "VARCHAR",
+    "utm_campaign": "VARCHAR",
+    "visitor_hash": "BIGINT",
+    "content_type_id": "INTEGER",
+    "object_id": "INTEGER",
+    "weight": "INTEGER",
+}
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS pageviews ("
+    + ", ".join(f"{name} {COLUMN_TYPES[name]}" for name in FIELDS)
+    + ", day DATE);"
+    "ALTER TABLE pageviews ADD COLUMN IF NOT EXISTS weight INTEGER DEFAULT 1;"
+    "CREATE TABLE IF NOT EXISTS archived_days (day DATE PRIMARY KEY, views BIGINT NOT NULL);"
+)
+
+
+def archive_dir():
+    path = getattr(settings, "ANALYTICS_ARCHIVE_DIR", None)
+    return Path(path) if path else None
+
+
+def is_enabled():
+    """True when an archive directory is configured and duckdb is importable."""
+    if archive_dir() is None:
+        return False
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def month_file(day):
+    return archive_dir() / f"pageviews-{day:%Y-%m}.duckdb"
+
+
+def _connect(path, read_only=False):
+    import duckdb
+
+    return duckdb.connect(str(path), read_only=read_only)
+
+
+def archive_day(day):
+    """Append every page view of ``day`` (local date) to its month file.
+
+    Idempotent: a day already listed in ``archived_days`` is skipped.
+    Returns the number of rows appended; ``archived_days`` records the
+    weighted view count.
+    """
+    path = month_file(day)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns = "{" + ", ".join(f"'{name}': '{COLUMN_TYPES[name]}'" for name in FIELDS) + "}"
+    with _connect(path) as con:
+        con.execute(SCHEMA)
+        if con.execute("SELECT 1 FROM archived_days WHERE day = ?", [day]).fetchone():
+            return 0
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "day.csv"
+            count = write_archive(date_range(PageView.objects.all(), day, day), csv_path)
+            con.execute("BEGIN TRANSACTION")
+            con.execute(
+                f"INSERT INTO pageviews ({', '.join(FIELDS)}, day) "  # noqa: S608 - columns built from constants
+                f"SELECT *, ?::DATE FROM read_csv(?, header = true, columns = {columns})",
+                [day, str(csv_path)],
+            )
+            con.execute(
+                "INSERT INTO archived_days SELECT ?, coalesce(sum(weight), 0) FROM pageviews WHERE day = ?", [day, day]
+            )
+            con.execute("COMMIT")
+    return count
+
+
+def _month_files():
+    directory = archive_dir()
+    return sorted(directory.glob("pageviews-*.duckdb")) if directory and directory.exists() else []
+
+
+def archived_days():
+    """``{day: views}`` for every archived day, across all month files."""
+    days = {}
+    for path in _month_files():
+        with _connect(path, read_only=True) as con:
+            days.update(con.execute("SELECT day, views FROM archived_days").fetchall())
+    return days
+
+
+def archived_through(days=None):
+    """Last archived day, or ``None`` if nothing is archived yet."""
+    days = archived_days() if days is None else days
+    return max(days, default=None)
+
+
+def _views_between(days, horizon, start, end):
+    """Views on ``start``..``end`` (inclusive): archive up to ``horizon``, database after."""
+    archived = sum(n for day, n in days.items() if start <= day <= end)
+    live = date_range(PageView.objects.all(), max(start, horizon + timedelta(days=1)), end)
+    return archived + view_total(live)
+
+
+def long_range():
+    """All-time and year-to-date view counts (with last year's same period).
+
+    Returns ``{"all_time", "ytd", "ytd_prev"}``, or ``None`` when the archive
+    is disabled, empty or unreadable (e.g. locked by a running archiver).
+    """
+    if not is_enabled():
+        return None
+    figures = cache.get(CACHE_KEY)
+    if figures is not None:
+        return figures
+    import duckdb
+
+    try:
+        days = archived_days()
+    except duckdb.Error:
+        logger.warning("Analytics archive unreadable; falling back to the database.", exc_info=True)
+        return None
+    horizon = archived_through(days)
+    if horizon is None:
+        return None
+
+    today = timezone.localdate()
+    year_start = date(today.year, 1, 1)
+    try:
+        same_day_last_year = today.replace(year=today.year - 1)
+    except ValueError:  # 29 February
+        same_day_last_year = today - timedelta(days=366)
+    figures = {
+        "all_time": _views_between(days, horizon, date.min, today),
+        "ytd": _views_between(days, horizon, year_start, today),
+        "ytd_prev": _views_between(days, horizon, year_start.replace(year=today.year - 1), same_day_last_year),
+    }
+    cache.set(CACHE_KEY, figures, CACHE_TTL)
+    return figures
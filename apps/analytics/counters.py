@@ -0,0 +1,62 @@
+"""Denormalised view counters on tracked content.
+
+Articles, writeups, lessons, courses and modules carry ``view_count`` (all
+time) and ``views_30d`` so admin changelists can show and sort by views
+without counting ``PageView`` through the generic relation.
+
+``record_view`` bumps both on every recorded view with a single ``UPDATE``.
+``views_30d`` only ever grows that way, so ``refresh`` recomputes it from
+the raw rows on a schedule (``manage.py refresh_view_counts``). ``view_count``
+survives ``prune_pageviews``; recomputing it (``all_time=True``) is only
+meant for backfilling, as pruned views cannot be counted again.
+"""
+
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.analytics.models import PageView, weighted_views
+
+WINDOW_DAYS = 30
+
+
+def counted_models():
+    """Concrete models carrying the denormalised counters."""
+    fields = {"view_count", "views_30d", "page_views"}
+    return [m for m in apps.get_models() if fields <= {f.name for f in m._meta.get_fields()}]
+
+
+def record_view(obj, weight=1):
+    """Add ``weight`` views (the row's sample weight) to ``obj``'s counters, if it has any."""
+    if not hasattr(obj, "view_count"):
+        return
+    type(obj)._default_manager.filter(pk=obj.pk).update(
+        view_count=F("view_count") + weight,
+        views_30d=F("views_30d") + weight,
+    )
+
+
+def _views_of(model, since=None):
+    qs = PageView.objects.filter(
+        content_type=ContentType.objects.get_for_model(model),
+        object_id=OuterRef("pk"),
+    )
+    if since is not None:
+        qs = qs.filter(created_at__gte=since)
+    return Coalesce(Subquery(qs.order_by().values("object_id").annotate(n=weighted_views()).values("n")), 0)
+
+
+def refresh(model, all_time=False):
+    """Recompute ``model``'s counters in one correlated ``UPDATE``.
+
+    Returns the number of rows updated.
+    """
+    since = timezone.now() - timedelta(days=WINDOW_DAYS)
+    values = {"views_30d": _views_of(model, since)}
+    if all_time:
+        values["view_count"] = _views_of(model)
+    return model._default_manager.update(**values)
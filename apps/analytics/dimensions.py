@@ -0,0 +1,59 @@
+"""Resolve page-view dimensions (path, referrer host, UTM triple) to ids.
+
+Each distinct value lives once in its lookup table; a page view only stores
+the id. Ids never change once assigned, so they are memoised per process in
+small bounded dicts and the hot path costs no query after the first hit.
+"""
+
+from django.db import IntegrityError, transaction
+
+from apps.analytics.models import Campaign, PagePath, Referrer
+
+# Per-process memo size per dimension; cleared wholesale when full.
+MAX_ENTRIES = 5000
+
+_paths = {}
+_referrers = {}
+_campaigns = {}
+
+
+def clear():
+    """Forget every memoised id (tests, or after a failed insert)."""
+    _paths.clear()
+    _referrers.clear()
+    _campaigns.clear()
+
+
+def _resolve(memo, key, model, **lookup):
+    pk = memo.get(key)
+    if pk is None:
+        try:
+            with transaction.atomic():
+                pk = model.objects.get_or_create(**lookup)[0].pk
+        except IntegrityError:  # lost a race with a concurrent insert
+            pk = model.objects.get(**lookup).pk
+        if len(memo) >= MAX_ENTRIES:
+            memo.clear()
+        memo[key] = pk
+    return pk
+
+
+def path_id(path):
+    path = path[:512]
+    return _resolve(_paths, path, PagePath, path=path)
+
+
+def referrer_id(host):
+    """Id for ``host``, ``None`` when blank (direct / internal traffic)."""
+    if not host:
+        return None
+    host = host[:255]
+    return _resolve(_referrers, host, Referrer, host=host)
+
+
+def campaign_id(source, medium, campaign):
+    """Id for a UTM triple, ``None`` when all three are blank."""
+    key = (source[:128], medium[:128], campaign[:128])
+    if not any(key):
+        return None
+    return _resolve(_campaigns, key, Campaign, source=key[0], medium=key[1], campaign=key[2])
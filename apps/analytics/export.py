@@ -0,0 +1,159 @@
+"""Serialise PageView rows as CSV or JSON Lines, optionally gzip-compressed.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` in primary-key
+order, so memory stays flat no matter how many rows are written and no model
+instances are built. Interned dimensions are joined back to their values so
+archives stay self-describing. The output format is picked from the file
+name: ``.csv`` / ``.jsonl``, each optionally suffixed with ``.gz``.
+
+Besides raw rows, ``iter_daily`` yields a per-day, per-path rollup (views and
+unique visitors). ``iter_bytes`` turns either into encoded chunks, gzipped on
+the fly if asked, for ``StreamingHttpResponse`` or a binary file.
+"""
+
+import csv
+import gzip
+import json
+import zlib
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.analytics.models import weighted_views
+
+FIELDS = (
+    "id",
+    "created_at",
+    "path",
+    "referrer",
+    "utm_source",
+    "utm_medium",
+    "utm_campaign",
+    "visitor_hash",
+    "content_type_id",
+    "object_id",
+    "weight",
+)
+DAILY_FIELDS = ("day", "path", "views", "visitors")
+# Output column -> ORM lookup, for columns that differ from the field name.
+LOOKUPS = {
+    "path": "path__path",
+    "referrer": "referrer__host",
+    "utm_source": "campaign__source",
+    "utm_medium": "campaign__medium",
+    "utm_campaign": "campaign__campaign",
+}
+FORMATS = ("csv", "jsonl")
+CHUNK_SIZE = 2000
+# Encoded output is handed out in pieces of roughly this many bytes.
+BUFFER_SIZE = 64 * 1024
+
+
+def format_for(path):
+    """``"csv"`` or ``"jsonl"`` from a file name, ``None`` if unsupported."""
+    name = str(path).lower().removesuffix(".gz")
+    for fmt in FORMATS:
+        if name.endswith(f".{fmt}"):
+            return fmt
+    return None
+
+
+def day_start(day):
+    """Aware datetime of local midnight on ``day``."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def date_range(queryset, since=None, until=None):
+    """Restrict ``queryset`` to views on ``since``..``until`` (inclusive local dates).
+
+    Bounds are compared as datetimes, not with ``created_at__date``, so the
+    ``created_at`` index can serve the range.
+    """
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=day_start(since))
+    if until is not None:
+        queryset = queryset.filter(created_at__lt=day_start(until + timedelta(days=1)))
+    return queryset
+
+
+def iter_rows(queryset, chunk_size=CHUNK_SIZE):
+    """Yield plain tuples in ``FIELDS`` order, streamed from the database."""
+    lookups = [LOOKUPS.get(f, f) for f in FIELDS]
+    yield from queryset.order_by("pk").values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def iter_daily(queryset, chunk_size=CHUNK_SIZE):
+    """Yield ``DAILY_FIELDS`` tuples: views and unique visitors per day and path."""
+    yield from (
+        queryset.annotate(day=TruncDate("created_at"))
+        .values_list("day", "path__path")
+        .annotate(views=weighted_views(), visitors=Count("visitor_hash", distinct=True))
+        .order_by("day", "path__path")
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _jsonable(value):
+    return value.isoformat() if isinstance(value, datetime | date) else value
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the line back to ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def iter_lines(rows, fmt, fields=FIELDS):
+    """Yield the text lines of ``rows`` (CSV starts with a header)."""
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow([_jsonable(v) for v in row])
+    else:
+        for row in rows:
+            yield json.dumps({k: _jsonable(v) for k, v in zip(fields, row, strict=True)}) + "\n"
+
+
+def iter_bytes(rows, fmt, fields=FIELDS, compress=False):
+    """Encoded output of ``iter_lines`` in ~``BUFFER_SIZE`` chunks, gzipped if asked."""
+    gz = zlib.compressobj(wbits=31) if compress else None  # 31: gzip header + trailer
+    buf = []
+    size = 0
+    for line in iter_lines(rows, fmt, fields):
+        data = line.encode("utf-8")
+        buf.append(data)
+        size += len(data)
+        if size >= BUFFER_SIZE:
+            chunk = b"".join(buf)
+            buf, size = [], 0
+            chunk = gz.compress(chunk) if gz else chunk
+            if chunk:
+                yield chunk
+    tail = b"".join(buf)
+    if gz:
+        tail = gz.compress(tail) + gz.flush()
+    if tail:
+        yield tail
+
+
+def write_rows(rows, fh, fmt):
+    """Write ``rows`` to the text file ``fh``; returns the number written."""
+    count = 0
+    for line in iter_lines(rows, fmt):
+        fh.write(line)
+        count += 1
+    return count - 1 if fmt == "csv" else count
+
+
+def write_archive(queryset, path, chunk_size=CHUNK_SIZE):
+    """Stream ``queryset`` to ``path`` (format from the extension)."""
+    fmt = format_for(path)
+    if fmt is None:
+        raise ValueError(f"Unsupported archive format for {path!r}; use .csv, .jsonl (optionally .gz).")
+    opener = gzip.open if str(path).lower().endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8", newline="") as fh:
+        return write_rows(iter_rows(queryset, chunk_size), fh, fmt)
@@ -0,0 +1,74 @@
+"""Live "Last hour" feed for the Analytics admin page (short-polled JSON).
+
+Every open dashboard polls ``analytics_live`` once per
+``ANALYTICS_LIVE_INTERVAL`` seconds (never less than ``MIN_LIVE_INTERVAL``);
+none of them query the database directly. ``snapshot()`` builds the realtime
+aggregate at most once per interval: within a worker process all requests
+share one in-memory copy (guarded by a lock so concurrent polls do not
+stampede), and across gunicorn workers the shared cache holds it. Each poll
+is a short request, so open dashboards never hold a worker thread the way a
+long-lived stream (SSE) would on the small gthread pool.
+
+The aggregate is polled from ``PageView`` (a per-minute ``GROUP BY`` over the
+last hour) rather than kept as running per-minute counters in memory: page
+views are recorded by whichever worker served the page, so no single
+process sees them all, and the database is the one place that does. The
+poll costs a few indexed queries per interval, whatever the number of open
+dashboards.
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.analytics.metrics import _path_row, _realtime_series, _top
+from apps.analytics.models import PageView, unique_total, view_total
+
+LIVE_INTERVAL = 5
+# Floor on the poll period, whatever the setting says.
+MIN_LIVE_INTERVAL = 2
+CACHE_KEY = "analytics:live"
+
+_lock = threading.Lock()
+_memo = {"data": None, "expires": 0.0}
+
+
+def poll_interval():
+    return max(getattr(settings, "ANALYTICS_LIVE_INTERVAL", LIVE_INTERVAL), MIN_LIVE_INTERVAL)
+
+
+def build():
+    """The realtime aggregate, JSON-ready (same figures as the static panel)."""
+    views = PageView.objects.all()
+    rt = views.filter(created_at__gte=timezone.now() - timedelta(hours=1))
+    series, peak = _realtime_series(views)
+    return {
+        "views": view_total(rt),
+        "uniques": unique_total(rt),
+        "peak": peak,
+        "bucket": series[0]["span"] if series else None,
+        "series": [
+            {"label": timezone.localtime(s["min"]).strftime("%H:%M"), "count": s["count"], "pct": s["pct"]}
+            for s in series
+        ],
+        "pages": _top(rt, "path", 5, _path_row),
+    }
+
+
+def snapshot():
+    """The shared aggregate, rebuilt at most once per interval."""
+    interval = poll_interval()
+    with _lock:
+        now = time.monotonic()
+        if _memo["data"] is not None and now < _memo["expires"]:
+            return _memo["data"]
+        data = cache.get(CACHE_KEY)
+        if data is None:
+            data = build()
+            cache.set(CACHE_KEY, data, interval)
+        _memo.update(data=data, expires=now + interval)
+        return data
@@ -0,0 +1,59 @@
+"""Append closed days of page views to the columnar archive (DuckDB).
+
+Requires ``ANALYTICS_ARCHIVE_DIR`` and the optional ``duckdb`` package
+(``pip install -r requirements/analytics.txt``). Run daily from cron, before
+``prune_pageviews``:
+
+    python manage.py archive_pageviews
+    python manage.py prune_pageviews --days 90
+
+Every day after the last archived one, up to ``--through`` (default:
+yesterday), is appended to its ``pageviews-YYYY-MM.duckdb`` file. Days
+already archived are skipped, so re-running is harmless.
+"""
+
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.analytics import columnar
+from apps.analytics.models import PageView
+
+
+class Command(BaseCommand):
+    help = "Append closed days of page views to the DuckDB archive (one file per month)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--through",
+            type=date.fromisoformat,
+            help="Last day to archive (YYYY-MM-DD, default yesterday; today is never archived).",
+        )
+
+    def handle(self, *args, **options):
+        if not columnar.is_enabled():
+            raise CommandError("Set ANALYTICS_ARCHIVE_DIR and install duckdb (requirements/analytics.txt).")
+
+        yesterday = timezone.localdate() - timedelta(days=1)
+        through = min(options["through"] or yesterday, yesterday)
+        last = columnar.archived_through()
+        if last is not None:
+            day = last + timedelta(days=1)
+        else:
+            oldest = PageView.objects.aggregate(first=Min("created_at"))["first"]
+            if oldest is None:
+                self.stdout.write("No page views to archive.")
+                return
+            day = timezone.localdate(oldest)
+
+        archived = 0
+        while day <= through:
+            count = columnar.archive_day(day)
+            self.stdout.write(f"{day}: {count} page views archived.")
+            archived += 1
+            day += timedelta(days=1)
+        cache.delete(columnar.CACHE_KEY)
+        self.stdout.write(self.style.SUCCESS(f"{archived} day(s) archived."))
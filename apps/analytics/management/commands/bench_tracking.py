@@ -0,0 +1,73 @@
+"""Microbenchmark of the page-view tracking overhead added to each request.
+
+Times the pieces ``PageViewMiddleware`` runs on a public page (bot check,
+visitor fingerprint) and the full ``_record`` call, database writes
+included, on synthetic requests:
+
+    python manage.py bench_tracking --iterations 2000
+
+Writes happen inside a transaction that is rolled back, so the command can
+be pointed at a real database without leaving rows behind. Figures are
+per-call means in microseconds; compare runs on the same machine.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from apps.analytics import dimensions
+from apps.analytics.middleware import PageViewMiddleware
+from apps.analytics.tracking import is_bot, visitor_hash
+
+DEFAULT_ITERATIONS = 1000
+USER_AGENTS = (
+    "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15",
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+)
+
+
+class Command(BaseCommand):
+    help = "Measure the per-request overhead of page-view tracking."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=DEFAULT_ITERATIONS,
+            help=f"Calls timed per measurement (default {DEFAULT_ITERATIONS}).",
+        )
+
+    @override_settings(ALLOWED_HOSTS=["testserver"])  # synthetic requests use RequestFactory's host
+    def handle(self, *args, **options):
+        n = options["iterations"]
+        factory = RequestFactory()
+        requests = [
+            factory.get(
+                f"/en/blog/post-{i % 50}/",
+                HTTP_USER_AGENT=USER_AGENTS[i % len(USER_AGENTS)],
+                REMOTE_ADDR=f"192.0.2.{i % 250}",
+                HTTP_REFERER="https://news.ycombinator.com/",
+            )
+            for i in range(n)
+        ]
+        response = HttpResponse("<html></html>", content_type="text/html")
+        middleware = PageViewMiddleware(lambda _request: response)
+
+        self._report("is_bot", n, lambda i: is_bot(requests[i].META["HTTP_USER_AGENT"]))
+        self._report("visitor_hash", n, lambda i: visitor_hash(requests[i]))
+        with transaction.atomic():
+            dimensions.clear()
+            self._report("_record (db writes)", n, lambda i: middleware._record(requests[i], response))
+            transaction.set_rollback(True)
+        dimensions.clear()
+
+    def _report(self, label, n, fn):
+        start = time.perf_counter()
+        for i in range(n):
+            fn(i)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{label:<22} {elapsed / n * 1e6:10.1f} µs/call")
@@ -0,0 +1,74 @@
+"""Export page views (or a daily per-path rollup) as CSV or JSON Lines.
+
+Rows are streamed from the database in chunks, so memory stays flat however
+large the range:
+
+    python manage.py export_pageviews --since 2025-01-01 --until 2025-12-31 -o views-2025.csv.gz
+    python manage.py export_pageviews --daily --format jsonl > daily.jsonl
+
+The format and compression follow the ``--output`` extension (``.csv`` /
+``.jsonl``, optionally ``.gz``); ``--format`` / ``--gzip`` apply to stdout.
+The same export is available from the Analytics admin page.
+"""
+
+import sys
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics import export
+from apps.analytics.models import PageView
+
+
+class Command(BaseCommand):
+    help = "Stream PageView rows (or daily rollups) for a date range as CSV/JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=date.fromisoformat, help="First day included (YYYY-MM-DD).")
+        parser.add_argument("--until", type=date.fromisoformat, help="Last day included (YYYY-MM-DD).")
+        parser.add_argument(
+            "-o",
+            "--output",
+            metavar="PATH",
+            help="Write to PATH (.csv or .jsonl, optionally .gz) instead of stdout.",
+        )
+        parser.add_argument("--format", choices=export.FORMATS, default="csv", help="Output format for stdout.")
+        parser.add_argument("--gzip", action="store_true", help="Gzip the stdout output.")
+        parser.add_argument(
+            "--daily",
+            action="store_true",
+            help="Export views and unique visitors per day and path instead of raw rows.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=export.CHUNK_SIZE,
+            help=f"Rows fetched per database round-trip (default {export.CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        fmt, compress = options["format"], options["gzip"]
+        if output:
+            fmt = export.format_for(output)
+            if fmt is None:
+                raise CommandError("--output must end in .csv, .jsonl, .csv.gz or .jsonl.gz.")
+            compress = output.lower().endswith(".gz")
+
+        queryset = export.date_range(PageView.objects.all(), options["since"], options["until"])
+        if options["daily"]:
+            rows = export.iter_daily(queryset, options["chunk_size"])
+            fields = export.DAILY_FIELDS
+        else:
+            rows = export.iter_rows(queryset, options["chunk_size"])
+            fields = export.FIELDS
+        chunks = export.iter_bytes(rows, fmt, fields, compress=compress)
+
+        if output:
+            with open(output, "wb") as fh:
+                fh.writelines(chunks)
+            self.stderr.write(self.style.SUCCESS(f"Exported page views to {output}."))
+        else:
+            out = sys.stdout.buffer
+            out.writelines(chunks)
+            out.flush()
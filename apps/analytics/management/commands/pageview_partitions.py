@@ -0,0 +1,65 @@
+"""Manage monthly PageView partitions on PostgreSQL.
+
+One-off switch to the partitioned layout (rewrites the table, run it in a
+maintenance window):
+
+    python manage.py pageview_partitions --convert
+
+Then keep future months pre-created on a schedule (cron), e.g. weekly:
+
+    python manage.py pageview_partitions --ahead 3
+
+Once converted, ``prune_pageviews`` drops whole expired months instead of
+deleting rows. On SQLite this command is a no-op: the single table is used.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics import partitions
+
+DEFAULT_AHEAD = 3
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly PageView partitions (PostgreSQL only)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=DEFAULT_AHEAD,
+            help=f"Months to pre-create after the current one (default {DEFAULT_AHEAD}).",
+        )
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Rebuild the existing PageView table as a partitioned table first.",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List the existing partitions and their estimated row counts.",
+        )
+
+    def handle(self, *args, **options):
+        if not partitions.is_supported():
+            self.stdout.write("Partitioning requires PostgreSQL; PageView stays a single table.")
+            return
+
+        if options["convert"]:
+            if partitions.is_partitioned():
+                raise CommandError("PageView is already partitioned.")
+            partitions.convert(ahead=options["ahead"])
+            self.stdout.write(self.style.SUCCESS("PageView converted to monthly partitions."))
+        elif not partitions.is_partitioned():
+            raise CommandError("PageView is not partitioned yet; run with --convert first.")
+
+        created = partitions.ensure_partitions(ahead=options["ahead"])
+        for name in created:
+            self.stdout.write(f"Created {name}")
+
+        if options["list"]:
+            for name, _month, rows in partitions.list_partitions():
+                self.stdout.write(f"{name:<40} ~{rows} rows")
+
+        self.stdout.write(self.style.SUCCESS(f"{len(created)} partition(s) created."))
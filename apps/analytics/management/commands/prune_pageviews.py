@@ -6,17 +6,39 @@ daily:
     python manage.py prune_pageviews --days 365
 
 The dashboard only ever looks at the last 30 days, so a generous retention
-(months) keeps history without unbounded growth.
+(months) keeps history without unbounded growth. To keep that history off the
+database, ``--archive`` first streams the expiring rows to a file:
+
+    python manage.py prune_pageviews --days 365 --archive /backups/pageviews-2025.jsonl.gz
+
+Rows are removed in primary-key ranges of ``--batch-size`` with plain
+``DELETE`` statements (no model instances, no signals), pausing ``--sleep``
+seconds between batches so each transaction stays short and concurrent
+inserts are not blocked behind one long lock.
+
+With the columnar archive enabled (``ANALYTICS_ARCHIVE_DIR``), pruning
+refuses to run unless every day from the oldest expiring row through the
+cutoff day has been copied by ``archive_pageviews``.
+
+When the table is partitioned (``pageview_partitions --convert``, PostgreSQL
+only), months entirely older than the cutoff are detached and dropped as a
+whole; only the month straddling the cutoff is pruned row by row.
 """
 
+import time
 from datetime import timedelta
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
 from django.utils import timezone
 
+from apps.analytics import columnar, partitions
+from apps.analytics.export import format_for, write_archive
 from apps.analytics.models import PageView
 
 DEFAULT_DAYS = 365
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_SLEEP = 0.1
 
 
 class Command(BaseCommand):
@@ -34,16 +56,78 @@ class Command(BaseCommand):
             action="store_true",
             help="Report how many rows would be deleted without deleting.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Width of each primary-key range deleted at once (default {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=DEFAULT_SLEEP,
+            help=f"Seconds to pause between batches (default {DEFAULT_SLEEP}).",
+        )
+        parser.add_argument(
+            "--archive",
+            metavar="PATH",
+            help="Write the expiring rows to PATH (.csv or .jsonl, optionally .gz) before deleting them.",
+        )
 
     def handle(self, *args, **options):
         days = options["days"]
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+        archive = options["archive"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+        if archive and format_for(archive) is None:
+            raise CommandError("--archive must end in .csv, .jsonl, .csv.gz or .jsonl.gz.")
+
         cutoff = timezone.now() - timedelta(days=days)
         qs = PageView.objects.filter(created_at__lt=cutoff)
-        count = qs.count()
+        if columnar.is_enabled():
+            self._check_archived(qs, cutoff)
+
+        if dry_run:
+            if partitions.is_partitioned():
+                for name, rows in partitions.drop_partitions_before(cutoff, dry_run=True):
+                    self.stdout.write(f"[dry-run] would drop partition {name} (~{rows} rows).")
+            self.stdout.write(f"[dry-run] {qs.count()} page views older than {days} days would be deleted.")
+            return
+
+        if archive:
+            written = write_archive(qs, archive)
+            self.stdout.write(f"Archived {written} page views to {archive}.")
+
+        if partitions.is_partitioned():
+            for name, rows in partitions.drop_partitions_before(cutoff):
+                self.stdout.write(f"Dropped partition {name} (~{rows} rows).")
+
+        deleted = self._delete_in_batches(qs, batch_size, options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} page views older than {days} days."))
 
-        if options["dry_run"]:
-            self.stdout.write(f"[dry-run] {count} page views older than {days} days would be deleted.")
+    def _check_archived(self, qs, cutoff):
+        """Fail unless every day with expiring rows, the cutoff day included, is archived."""
+        oldest = qs.aggregate(first=Min("created_at"))["first"]
+        if oldest is None:
             return
+        archived = columnar.archived_days()
+        day, last = timezone.localdate(oldest), timezone.localdate(cutoff)
+        while day <= last:
+            if day not in archived:
+                raise CommandError(f"Run archive_pageviews first: {day} is not archived yet.")
+            day += timedelta(days=1)
 
-        qs.delete()
-        self.stdout.write(self.style.SUCCESS(f"Deleted {count} page views older than {days} days."))
+    def _delete_in_batches(self, qs, batch_size, pause):
+        """Raw-delete ``qs`` one primary-key range at a time."""
+        bounds = qs.aggregate(lo=Min("pk"), hi=Max("pk"))
+        if bounds["lo"] is None:
+            return 0
+        deleted = 0
+        for start in range(bounds["lo"], bounds["hi"] + 1, batch_size):
+            batch = qs.filter(pk__gte=start, pk__lt=start + batch_size)
+            deleted += batch._raw_delete(batch.db)
+            if pause and start + batch_size <= bounds["hi"]:
+                time.sleep(pause)
+        return deleted
@@ -0,0 +1,33 @@
+"""Recompute the denormalised ``views_30d`` counter on tracked content.
+
+``PageViewMiddleware`` increments the counters as views come in, but the
+rolling 30-day figure also has to shrink as views age out. Run on a schedule
+(cron), e.g. hourly or daily:
+
+    python manage.py refresh_view_counts
+
+``--all-time`` also rebuilds ``view_count`` from the stored page views; use it
+once to backfill, not routinely, since views removed by ``prune_pageviews``
+would be lost from the total.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute views_30d (and optionally view_count) on tracked content."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all-time",
+            action="store_true",
+            help="Also rebuild the all-time view_count from the stored page views.",
+        )
+
+    def handle(self, *args, **options):
+        for model in counters.counted_models():
+            updated = counters.refresh(model, all_time=options["all_time"])
+            self.stdout.write(f"{model._meta.label}: {updated} rows refreshed.")
+        self.stdout.write(self.style.SUCCESS("View counters refreshed."))
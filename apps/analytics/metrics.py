@@ -6,14 +6,20 @@ all page-view logic lives in the analytics app.
 
 from datetime import timedelta
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Count
-from django.db.models.functions import TruncDate
+from django.db.models.functions import TruncDate, TruncMinute
 from django.urls import NoReverseMatch, reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from apps.analytics.models import PageView
+from apps.analytics import columnar
+from apps.analytics.models import PageView, unique_total, view_total, weighted_views
+from apps.analytics.tracking import sampling_enabled
+
+# Defaults for the "Last hour" panel; overridable via settings.
+REALTIME_MINUTES = 60
+REALTIME_BUCKET = 5
 
 
 def _pct_change(current, previous):
@@ -32,7 +38,7 @@ def _daily_series(views, days=30):
         views.filter(created_at__date__gte=start)
         .annotate(day=TruncDate("created_at"))
         .values("day")
-        .annotate(n=Count("id"))
+        .annotate(n=weighted_views())
     )
     counts = {r["day"]: r["n"] for r in rows}
     series = [
@@ -44,17 +50,33 @@ def _daily_series(views, days=30):
     return series, peak
 
 
-def _realtime_series(views, minutes=60, bucket=5):
-    """Counts grouped into bucket -minute slots over the last minutes."""
+def _realtime_series(views, minutes=None, bucket=None):
+    """Counts grouped into ``bucket``-minute slots over the last ``minutes``.
+
+    The database does the heavy lifting: rows are truncated to the minute and
+    counted in SQL, so at most ``minutes`` small rows come back regardless of
+    traffic, and only the final fold into wider buckets happens here. Window
+    and bucket width default to ``ANALYTICS_REALTIME_MINUTES`` /
+    ``ANALYTICS_REALTIME_BUCKET`` so a live panel can be tuned per site.
+    """
+    minutes = minutes or getattr(settings, "ANALYTICS_REALTIME_MINUTES", REALTIME_MINUTES)
+    bucket = max(1, min(bucket or getattr(settings, "ANALYTICS_REALTIME_BUCKET", REALTIME_BUCKET), minutes))
     now = timezone.now()
     cur = now.replace(second=0, microsecond=0)
     start = cur - timedelta(minutes=minutes - 1)
     nslots = -(-minutes // bucket)  # ceil
     slots = [0] * nslots
-    for ts in views.filter(created_at__gte=start).values_list("created_at", flat=True):
-        mi = int((ts - start).total_seconds() // 60)
+    rows = (
+        views.filter(created_at__gte=start)
+        .annotate(minute=TruncMinute("created_at"))
+        .values("minute")
+        .annotate(n=weighted_views())
+        .order_by()
+    )
+    for r in rows:
+        mi = int((r["minute"] - start).total_seconds() // 60)
         if 0 <= mi < minutes:
-            slots[mi // bucket] += 1
+            slots[mi // bucket] += r["n"]
     series = [{"min": start + timedelta(minutes=i * bucket), "span": bucket, "count": c} for i, c in enumerate(slots)]
     peak = max(slots, default=0) or 1
     for s in series:
@@ -67,7 +89,7 @@ def _top_content(views, since, limit=10):
     rows = (
         views.filter(content_type__isnull=False, created_at__gte=since)
         .values("content_type", "object_id")
-        .annotate(n=Count("id"))
+        .annotate(n=weighted_views())
         .order_by("-n")[:limit]
     )
     items = []
@@ -85,6 +107,32 @@ def _top_content(views, since, limit=10):
     return items
 
 
+def _top(views, field, limit, resolve):
+    """Top ``limit`` values of the FK ``field`` by view count.
+
+    Grouping happens on the integer id; the handful of winning ids are then
+    resolved in one ``in_bulk`` query and turned into template rows by
+    ``resolve(obj)``, each gaining the count as ``n``.
+    """
+    rows = list(
+        views.filter(**{f"{field}__isnull": False}).values(field).annotate(n=weighted_views()).order_by("-n")[:limit]
+    )
+    objs = views.model._meta.get_field(field).related_model.objects.in_bulk([r[field] for r in rows])
+    return [{**resolve(objs[r[field]]), "n": r["n"]} for r in rows if r[field] in objs]
+
+
+def _path_row(obj):
+    return {"path": obj.path}
+
+
+def _referrer_row(obj):
+    return {"referrer": obj.host}
+
+
+def _campaign_row(obj):
+    return {"utm_source": obj.source, "utm_medium": obj.medium, "utm_campaign": obj.campaign}
+
+
 def full_metrics(context):
     """Richer analytics for the dedicated Analytics admin page."""
     now = timezone.now()
@@ -94,56 +142,62 @@ def full_metrics(context):
     d60 = now - timedelta(days=60)
     views = PageView.objects.all()
 
-    v7 = views.filter(created_at__gte=d7).count()
-    v7_prev = views.filter(created_at__gte=d14, created_at__lt=d7).count()
-    v30 = views.filter(created_at__gte=d30).count()
-    v30_prev = views.filter(created_at__gte=d60, created_at__lt=d30).count()
-    u7 = views.filter(created_at__gte=d7).values("visitor_hash").distinct().count()
-    u7_prev = views.filter(created_at__gte=d14, created_at__lt=d7).values("visitor_hash").distinct().count()
-    u30 = views.filter(created_at__gte=d30).values("visitor_hash").distinct().count()
-    u30_prev = views.filter(created_at__gte=d60, created_at__lt=d30).values("visitor_hash").distinct().count()
-
+    v7 = view_total(views.filter(created_at__gte=d7))
+    v7_prev = view_total(views.filter(created_at__gte=d14, created_at__lt=d7))
+    v30 = view_total(views.filter(created_at__gte=d30))
+    v30_prev = view_total(views.filter(created_at__gte=d60, created_at__lt=d30))
+    u7 = unique_total(views.filter(created_at__gte=d7))
+    u7_prev = unique_total(views.filter(created_at__gte=d14, created_at__lt=d7))
+    u30 = unique_total(views.filter(created_at__gte=d30))
+    u30_prev = unique_total(views.filter(created_at__gte=d60, created_at__lt=d30))
+    # Figures estimated from a sample carry a marker on their card; each
+    # card looks at its own window only.
+    sampled_7d = views.filter(created_at__gte=d7, weight__gt=1).exists()
+    sampled_30d = sampled_7d or views.filter(created_at__gte=d30, weight__gt=1).exists()
+
+    # All-time / year-over-year figures come from the columnar archive when
+    # it is enabled, since the database only keeps the recent window then.
+    long_range = columnar.long_range()
     metrics = {
         "views_7d": v7,
         "views_30d": v30,
-        "views_all": views.count(),
+        "views_all": long_range["all_time"] if long_range else view_total(views),
         "uniques_7d": u7,
         "uniques_30d": u30,
     }
     context["metrics"] = metrics
-    # (label, value, delta%) — delta is None for the all-time card (no baseline).
+    # Scanning every row for a weight would cost as much as the total itself:
+    # the all-time figure is marked while sampling is configured, or while
+    # the last 30 days still hold sampled rows.
+    sampled_all = sampled_30d or sampling_enabled()
+    # (label, value, delta%, sampled) — delta is None for the all-time card (no baseline).
     context["cards"] = [
-        (_("Views (7 days)"), v7, _pct_change(v7, v7_prev)),
-        (_("Views (30 days)"), v30, _pct_change(v30, v30_prev)),
-        (_("Views (all time)"), metrics["views_all"], None),
-        (_("Unique visitors (7 days)"), u7, _pct_change(u7, u7_prev)),
-        (_("Unique visitors (30 days)"), u30, _pct_change(u30, u30_prev)),
+        (_("Views (7 days)"), v7, _pct_change(v7, v7_prev), sampled_7d),
+        (_("Views (30 days)"), v30, _pct_change(v30, v30_prev), sampled_30d),
+        (_("Views (all time)"), metrics["views_all"], None, sampled_all),
+        (_("Unique visitors (7 days)"), u7, _pct_change(u7, u7_prev), sampled_7d),
+        (_("Unique visitors (30 days)"), u30, _pct_change(u30, u30_prev), sampled_30d),
     ]
+    if long_range:
+        ytd = long_range["ytd"]
+        context["cards"].insert(
+            3, (_("Views (year to date)"), ytd, _pct_change(ytd, long_range["ytd_prev"]), sampled_all)
+        )
     context["views_series"], context["views_peak"] = _daily_series(views, days=30)
 
     rt = views.filter(created_at__gte=now - timedelta(hours=1))
     context["realtime"] = {
-        "views_1h": rt.count(),
-        "uniques_1h": rt.values("visitor_hash").distinct().count(),
+        "views_1h": view_total(rt),
+        "uniques_1h": unique_total(rt),
     }
-    context["realtime_series"], context["realtime_peak"] = _realtime_series(views, minutes=60, bucket=5)
-    context["realtime_pages"] = list(rt.values("path").annotate(n=Count("id")).order_by("-n")[:5])
+    series, peak = _realtime_series(views)
+    context["realtime_series"], context["realtime_peak"] = series, peak
+    context["realtime_bucket"] = series[0]["span"] if series else REALTIME_BUCKET
+    context["realtime_mid"] = series[len(series) // 2] if series else None
+    context["realtime_pages"] = _top(rt, "path", 5, _path_row)
 
     context["top_content"] = _top_content(views, d30, limit=10)
-    context["top_pages"] = list(
-        views.filter(created_at__gte=d30).values("path").annotate(n=Count("id")).order_by("-n")[:15]
-    )
-    context["top_referrers"] = list(
-        views.filter(created_at__gte=d30)
-        .exclude(referrer="")
-        .values("referrer")
-        .annotate(n=Count("id"))
-        .order_by("-n")[:10]
-    )
-    context["top_campaigns"] = list(
-        views.filter(created_at__gte=d30)
-        .exclude(utm_source="")
-        .values("utm_source", "utm_medium", "utm_campaign")
-        .annotate(n=Count("id"))
-        .order_by("-n")[:10]
-    )
+    recent = views.filter(created_at__gte=d30)
+    context["top_pages"] = _top(recent, "path", 15, _path_row)
+    context["top_referrers"] = _top(recent, "referrer", 10, _referrer_row)
+    context["top_campaigns"] = _top(recent.exclude(campaign__source=""), "campaign", 10, _campaign_row)
@@ -1,6 +1,7 @@
 import contextlib
 
 from django.conf import settings
+from django.db import IntegrityError
 
 
 class PageViewMiddleware:
@@ -8,8 +9,11 @@ class PageViewMiddleware:
 
     Runs after the view, so detail views can annotate ``request.tracked_object``
     to link the view to a content object. Refreshes by the same visitor on the
-    same path within 30 min are collapsed (cache-backed). Never lets an
-    analytics error break the page.
+    same path within 30 min are collapsed (cache-backed). Path, referrer host
+    and UTM values are stored as ids from ``apps.analytics.dimensions``.
+    With sampling configured, only a share of visitors is recorded and each
+    row carries the ``weight`` it stands for. Never lets an analytics error
+    break the page.
     """
 
     DEDUP_WINDOW = 60 * 30
@@ -37,7 +41,7 @@ class PageViewMiddleware:
         if any(path.startswith(p) for p in self._excluded):
             return
 
-        from apps.analytics.tracking import external_referrer, is_bot, visitor_hash
+        from apps.analytics.tracking import external_referrer, is_bot, is_sampled, sample_weight, visitor_hash
 
         if is_bot(request.META.get("HTTP_USER_AGENT", "")):
             return
@@ -45,6 +49,9 @@ class PageViewMiddleware:
         from django.core.cache import cache
 
         vhash = visitor_hash(request)
+        weight = sample_weight(path)
+        if not is_sampled(vhash, weight):
+            return
         cache_key = f"pv:{vhash}:{path}"
         if cache.get(cache_key):
             return
@@ -52,17 +59,28 @@ class PageViewMiddleware:
 
         from django.contrib.contenttypes.models import ContentType
 
+        from apps.analytics import counters, dimensions
         from apps.analytics.models import PageView
 
         obj = getattr(request, "tracked_object", None)
         ct = ContentType.objects.get_for_model(obj.__class__) if obj is not None else None
-        PageView.objects.create(
-            content_type=ct,
-            object_id=getattr(obj, "pk", None),
-            path=path[:512],
-            visitor_hash=vhash,
-            referrer=external_referrer(request)[:512],
-            utm_source=request.GET.get("utm_source", "")[:128],
-            utm_medium=request.GET.get("utm_medium", "")[:128],
-            utm_campaign=request.GET.get("utm_campaign", "")[:128],
-        )
+        try:
+            PageView.objects.create(
+                content_type=ct,
+                object_id=getattr(obj, "pk", None),
+                weight=weight,
+                path_id=dimensions.path_id(path),
+                visitor_hash=vhash,
+                referrer_id=dimensions.referrer_id(external_referrer(request)),
+                campaign_id=dimensions.campaign_id(
+                    request.GET.get("utm_source", ""),
+                    request.GET.get("utm_medium", ""),
+                    request.GET.get("utm_campaign", ""),
+                ),
+            )
+        except IntegrityError:
+            # A memoised id no longer exists (e.g. lookup rows were purged).
+            dimensions.clear()
+            raise
+        if obj is not None:
+            counters.record_view(obj, weight)
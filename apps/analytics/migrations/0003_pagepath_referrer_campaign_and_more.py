@@ -0,0 +1,89 @@
+# Generated by Django 6.0.4 on 2026-10-19 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_pageview_utm_campaign_pageview_utm_medium_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Campaign",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("source", models.CharField(blank=True, max_length=128)),
+                ("medium", models.CharField(blank=True, max_length=128)),
+                ("campaign", models.CharField(blank=True, max_length=128)),
+            ],
+            options={
+                "verbose_name": "Campaign",
+                "verbose_name_plural": "Campaigns",
+                "constraints": [
+                    models.UniqueConstraint(fields=("source", "medium", "campaign"), name="unique_utm_campaign")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PagePath",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("path", models.CharField(max_length=512, unique=True)),
+            ],
+            options={
+                "verbose_name": "Page path",
+                "verbose_name_plural": "Page paths",
+            },
+        ),
+        migrations.CreateModel(
+            name="Referrer",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("host", models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                "verbose_name": "Referrer",
+                "verbose_name_plural": "Referrers",
+            },
+        ),
+        migrations.AddField(
+            model_name="pageview",
+            name="campaign",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="views",
+                to="analytics.campaign",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pageview",
+            name="path_ref",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="analytics.pagepath",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pageview",
+            name="referrer_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="analytics.referrer",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pageview",
+            name="visitor_key",
+            field=models.BigIntegerField(null=True),
+        ),
+    ]
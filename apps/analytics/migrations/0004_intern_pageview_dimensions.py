@@ -0,0 +1,91 @@
+"""Move existing page views onto the interned dimension tables.
+
+Walks the table in primary-key ranges so a large history converts in bounded
+memory and short statements. Referrers are reduced to their host; each hex
+visitor hash keeps its first 64 bits as a signed integer, so visitors stay
+distinct. Converted rows only need to be comparable with each other: the
+fingerprint rotates daily, so an old row never has to match a new one.
+"""
+
+import hashlib
+from urllib.parse import urlsplit
+
+from django.db import migrations
+from django.db.models import Max, Min
+
+BATCH_SIZE = 5000
+
+
+def _visitor_key(value):
+    try:
+        key = int(value[:16], 16)
+    except ValueError:
+        return int.from_bytes(hashlib.sha256(value.encode()).digest()[:8], "big", signed=True)
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def _host(referrer):
+    if not referrer:
+        return ""
+    try:
+        return (urlsplit(referrer).hostname or "")[:255]
+    except ValueError:
+        return ""
+
+
+def forwards(apps, schema_editor):
+    PageView = apps.get_model("analytics", "PageView")
+    PagePath = apps.get_model("analytics", "PagePath")
+    Referrer = apps.get_model("analytics", "Referrer")
+    Campaign = apps.get_model("analytics", "Campaign")
+
+    bounds = PageView.objects.aggregate(lo=Min("pk"), hi=Max("pk"))
+    if bounds["lo"] is None:
+        return
+
+    paths, hosts, campaigns = {}, {}, {}
+    for start in range(bounds["lo"], bounds["hi"] + 1, BATCH_SIZE):
+        rows = list(
+            PageView.objects.filter(pk__gte=start, pk__lt=start + BATCH_SIZE).only(
+                "id", "path", "referrer", "utm_source", "utm_medium", "utm_campaign", "visitor_hash"
+            )
+        )
+        if not rows:
+            continue
+
+        for pv in rows:
+            pv._host = _host(pv.referrer)
+            pv._utm = (pv.utm_source, pv.utm_medium, pv.utm_campaign)
+
+        new_paths = {pv.path for pv in rows} - paths.keys()
+        if new_paths:
+            PagePath.objects.bulk_create([PagePath(path=p) for p in new_paths], ignore_conflicts=True)
+            paths.update(PagePath.objects.filter(path__in=new_paths).values_list("path", "id"))
+
+        new_hosts = {pv._host for pv in rows if pv._host} - hosts.keys()
+        if new_hosts:
+            Referrer.objects.bulk_create([Referrer(host=h) for h in new_hosts], ignore_conflicts=True)
+            hosts.update(Referrer.objects.filter(host__in=new_hosts).values_list("host", "id"))
+
+        new_campaigns = {pv._utm for pv in rows if any(pv._utm)} - campaigns.keys()
+        for source, medium, campaign in new_campaigns:
+            obj, _ = Campaign.objects.get_or_create(source=source, medium=medium, campaign=campaign)
+            campaigns[(source, medium, campaign)] = obj.pk
+
+        for pv in rows:
+            pv.path_ref_id = paths[pv.path]
+            pv.referrer_ref_id = hosts.get(pv._host)
+            pv.campaign_id = campaigns.get(pv._utm)
+            pv.visitor_key = _visitor_key(pv.visitor_hash)
+        PageView.objects.bulk_update(rows, ["path_ref", "referrer_ref", "campaign", "visitor_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0003_pagepath_referrer_campaign_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
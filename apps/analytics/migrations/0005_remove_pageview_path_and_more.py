@@ -0,0 +1,78 @@
+# Generated by Django 6.0.4 on 2026-10-19 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0004_intern_pageview_dimensions"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="pageview",
+            name="path",
+        ),
+        migrations.RemoveField(
+            model_name="pageview",
+            name="referrer",
+        ),
+        migrations.RemoveField(
+            model_name="pageview",
+            name="utm_campaign",
+        ),
+        migrations.RemoveField(
+            model_name="pageview",
+            name="utm_medium",
+        ),
+        migrations.RemoveField(
+            model_name="pageview",
+            name="utm_source",
+        ),
+        migrations.RemoveField(
+            model_name="pageview",
+            name="visitor_hash",
+        ),
+        migrations.RenameField(
+            model_name="pageview",
+            old_name="path_ref",
+            new_name="path",
+        ),
+        migrations.RenameField(
+            model_name="pageview",
+            old_name="referrer_ref",
+            new_name="referrer",
+        ),
+        migrations.RenameField(
+            model_name="pageview",
+            old_name="visitor_key",
+            new_name="visitor_hash",
+        ),
+        migrations.AlterField(
+            model_name="pageview",
+            name="path",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="views",
+                to="analytics.pagepath",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pageview",
+            name="referrer",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="views",
+                to="analytics.referrer",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pageview",
+            name="visitor_hash",
+            field=models.BigIntegerField(db_index=True),
+        ),
+    ]
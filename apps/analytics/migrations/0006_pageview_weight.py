@@ -0,0 +1,18 @@
+# Generated by Django 6.0.4 on 2026-10-19 14:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0005_remove_pageview_path_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pageview",
+            name="weight",
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+    ]
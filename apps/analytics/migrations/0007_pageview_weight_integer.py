@@ -0,0 +1,18 @@
+# Generated by Django 6.0.4 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0006_pageview_weight"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pageview",
+            name="weight",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
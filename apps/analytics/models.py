@@ -1,29 +1,87 @@
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models import Max, Sum
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 
 
+class PagePath(models.Model):
+    """A distinct request path, interned so page views store a small FK."""
+
+    path = models.CharField(max_length=512, unique=True)
+
+    class Meta:
+        verbose_name = _("Page path")
+        verbose_name_plural = _("Page paths")
+
+    def __str__(self):
+        return self.path
+
+
+class Referrer(models.Model):
+    """A distinct external referring host (``news.ycombinator.com``…).
+
+    Only the host is kept: full referrer URLs are high-cardinality, can carry
+    personal data in their query string, and the dashboard groups by site.
+    """
+
+    host = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        verbose_name = _("Referrer")
+        verbose_name_plural = _("Referrers")
+
+    def __str__(self):
+        return self.host
+
+
+class Campaign(models.Model):
+    """A distinct ``utm_source`` / ``utm_medium`` / ``utm_campaign`` triple."""
+
+    source = models.CharField(max_length=128, blank=True)
+    medium = models.CharField(max_length=128, blank=True)
+    campaign = models.CharField(max_length=128, blank=True)
+
+    class Meta:
+        verbose_name = _("Campaign")
+        verbose_name_plural = _("Campaigns")
+        constraints = [
+            models.UniqueConstraint(fields=["source", "medium", "campaign"], name="unique_utm_campaign"),
+        ]
+
+    def __str__(self):
+        return " / ".join(v for v in (self.source, self.medium, self.campaign) if v)
+
+
 class PageView(models.Model):
     """A single (de-duplicated) page visit.
 
     Recorded server-side by `PageViewMiddleware` so it is immune to ad
     blockers. No personal data is stored: `visitor_hash` is a non-reversible,
-    daily-rotating hash of IP + user-agent used only to estimate unique
+    daily-rotating 64-bit hash of IP + user-agent used only to estimate unique
     visitors. When the visited page is a content object (article, writeup…),
     the generic FK links the view to it for per-object counts.
+
+    Path, referrer host and UTM values are interned in small lookup tables
+    (`PagePath`, `Referrer`, `Campaign`) so each row is a handful of integers
+    and the dashboard's top-N queries group by integer keys.
+
+    When sampling is enabled (``ANALYTICS_SAMPLE_RATE(S)``) only one visitor in
+    `weight` is recorded, and each row stands for `weight` views: aggregate
+    with `weighted_views()` / `view_total()` / `unique_total()`, never a bare
+    row count.
     """
 
     content_type = models.ForeignKey(ContentType, on_delete=models.SET_NULL, null=True, blank=True)
     object_id = models.PositiveIntegerField(null=True, blank=True)
     content_object = GenericForeignKey("content_type", "object_id")
 
-    path = models.CharField(max_length=512, db_index=True)
-    visitor_hash = models.CharField(max_length=64, db_index=True)
-    referrer = models.CharField(max_length=512, blank=True)
-    utm_source = models.CharField(max_length=128, blank=True)
-    utm_medium = models.CharField(max_length=128, blank=True)
-    utm_campaign = models.CharField(max_length=128, blank=True)
+    path = models.ForeignKey(PagePath, on_delete=models.PROTECT, related_name="views")
+    visitor_hash = models.BigIntegerField(db_index=True)
+    referrer = models.ForeignKey(Referrer, on_delete=models.PROTECT, null=True, blank=True, related_name="views")
+    campaign = models.ForeignKey(Campaign, on_delete=models.PROTECT, null=True, blank=True, related_name="views")
+    weight = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
@@ -36,3 +94,18 @@ class PageView(models.Model):
 
     def __str__(self):
         return f"{self.path} @ {self.created_at:%Y-%m-%d %H:%M}"
+
+
+def weighted_views():
+    """Aggregate expression: estimated views (sum of sample weights)."""
+    return Coalesce(Sum("weight"), 0)
+
+
+def view_total(queryset):
+    return queryset.aggregate(n=weighted_views())["n"]
+
+
+def unique_total(queryset):
+    """Estimated unique visitors: each distinct visitor counts for its weight."""
+    per_visitor = queryset.order_by().values("visitor_hash").annotate(w=Max("weight"))
+    return per_visitor.aggregate(n=Coalesce(Sum("w"), 0))["n"]
@@ -0,0 +1,228 @@
+"""Optional monthly range partitioning of the PageView table (PostgreSQL).
+
+``PageView`` is append-only and only ever queried by recent time windows, so
+on PostgreSQL it can be stored as a declaratively partitioned table with one
+partition per calendar month of ``created_at``. Retention then becomes a
+metadata operation (``DETACH`` + ``DROP`` of whole months) instead of a bulk
+``DELETE`` that bloats the table and holds row locks.
+
+Nothing here changes the Django model: the parent table keeps its name and
+columns, so the ORM reads and writes it exactly as before. The mode is opt-in
+(``manage.py pageview_partitions --convert``) and detected from the catalog at
+runtime; on SQLite, or on an unconverted table, every helper degrades to the
+plain single-table behaviour.
+
+Partitions are named ``<table>_pYYYYMM`` and bounded in UTC. A ``DEFAULT``
+partition catches rows that land outside any pre-created month, so an insert
+can never fail because the scheduler forgot to run.
+"""
+
+from datetime import UTC, date, datetime
+
+from django.db import connection, transaction
+
+from apps.analytics.models import PageView
+
+TABLE = PageView._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def is_supported():
+    return connection.vendor == "postgresql"
+
+
+def is_partitioned():
+    """True when the PageView table is a partitioned table on PostgreSQL."""
+    if not is_supported():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [TABLE])
+        return cursor.fetchone() is not None
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def _month_from_name(name):
+    """Inverse of ``partition_name``; ``None`` for the default partition."""
+    suffix = name.removeprefix(f"{TABLE}_p")
+    if suffix == name or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+def _bound(month):
+    return datetime(month.year, month.month, 1, tzinfo=UTC)
+
+
+def list_partitions():
+    """``[(name, month | None, estimated_rows)]`` ordered oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, c.reltuples::bigint
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [TABLE],
+        )
+        rows = [(name, _month_from_name(name), max(tuples, 0)) for name, tuples in cursor.fetchall()]
+    return sorted(rows, key=lambda r: (r[1] is None, r[1] or date.min))
+
+
+def _has_default():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [DEFAULT_PARTITION])
+        return cursor.fetchone()[0]
+
+
+def create_partition(month):
+    """Create the partition for ``month`` if missing. Returns True if created.
+
+    If rows for that month already fell into the default partition, they are
+    moved into the new partition (PostgreSQL refuses to attach a range the
+    default partition still holds rows for).
+    """
+    name = partition_name(month)
+    lo, hi = _bound(month), _bound(add_months(month, 1))
+    qn = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        if cursor.fetchone()[0]:
+            return False
+
+        stray = False
+        if _has_default():
+            cursor.execute(
+                f"SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s)",  # noqa: S608 - identifiers are quoted constants
+                [lo, hi],
+            )
+            stray = cursor.fetchone()[0]
+
+        if stray:
+            cursor.execute(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(DEFAULT_PARTITION)}")
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} PARTITION OF {qn(TABLE)} FOR VALUES FROM (%s) TO (%s)",
+            [lo, hi],
+        )
+        if stray:
+            cursor.execute(
+                f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s",  # noqa: S608
+                [lo, hi],
+            )
+            cursor.execute(
+                f"DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s",  # noqa: S608
+                [lo, hi],
+            )
+            cursor.execute(f"ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(DEFAULT_PARTITION)} DEFAULT")
+    return True
+
+
+def ensure_partitions(ahead=3, today=None):
+    """Make sure the current month and ``ahead`` following months exist."""
+    current = month_start(today or datetime.now(UTC).date())
+    created = []
+    for i in range(ahead + 1):
+        month = add_months(current, i)
+        if create_partition(month):
+            created.append(partition_name(month))
+    return created
+
+
+def drop_partitions_before(cutoff, dry_run=False):
+    """Detach and drop every monthly partition entirely older than ``cutoff``.
+
+    Returns ``[(name, estimated_rows)]``. Rows of the month straddling the
+    cutoff are left for the caller to delete row-wise.
+    """
+    qn = connection.ops.quote_name
+    dropped = []
+    for name, month, rows in list_partitions():
+        if month is None or _bound(add_months(month, 1)) > cutoff:
+            continue
+        if not dry_run:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(name)}")
+                cursor.execute(f"DROP TABLE {qn(name)}")
+        dropped.append((name, rows))
+    return dropped
+
+
+def convert(ahead=3):
+    """Rebuild the plain PageView table as a monthly partitioned table.
+
+    Runs in a single transaction: the existing table is renamed aside, a
+    partitioned table with identical columns takes its name, partitions are
+    created for every month that holds data (plus ``ahead`` future months and
+    the default partition), rows are copied over and the old table dropped.
+    Secondary indexes are recreated from their original definitions so their
+    names (which migrations may refer to) are unchanged. The primary key
+    becomes ``(id, created_at)`` as PostgreSQL requires the partition key in
+    it; ``id`` stays identity-generated and unique in practice.
+    """
+    qn = connection.ops.quote_name
+    legacy = f"{TABLE}_legacy"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT i.indexname, i.indexdef
+            FROM pg_indexes i
+            WHERE i.tablename = %s
+              AND i.schemaname = current_schema()
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c
+                  WHERE c.conindid = to_regclass(quote_ident(i.indexname)) AND c.contype = 'p'
+              )
+            """,
+            [TABLE],
+        )
+        index_defs = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT c.conname, pg_get_constraintdef(c.oid)
+            FROM pg_constraint c
+            WHERE c.conrelid = to_regclass(%s) AND c.contype = 'f'
+            """,
+            [TABLE],
+        )
+        fk_defs = cursor.fetchall()
+
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} RENAME TO {qn(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {qn(TABLE)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f"CREATE TABLE {qn(DEFAULT_PARTITION)} PARTITION OF {qn(TABLE)} DEFAULT")
+
+        cursor.execute(f"SELECT min(created_at) FROM {qn(legacy)}")  # noqa: S608
+        oldest = cursor.fetchone()[0]
+        today = datetime.now(UTC).date()
+        month = month_start(oldest.astimezone(UTC) if oldest else today)
+        last = add_months(month_start(today), ahead)
+        while month <= last:
+            create_partition(month)
+            month = add_months(month, 1)
+
+        cursor.execute(f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(legacy)}")  # noqa: S608
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE((SELECT max(id) FROM {qn(TABLE)}), 0) + 1, false)",  # noqa: S608
+            [TABLE],
+        )
+        cursor.execute(f"DROP TABLE {qn(legacy)}")
+
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(TABLE + '_pkey')} PRIMARY KEY (id, created_at)")
+        for name, definition in fk_defs:
+            cursor.execute(f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(name)} {definition}")
+        for _name, definition in index_defs:
+            cursor.execute(definition)
@@ -0,0 +1,252 @@
+import gzip
+import importlib.util
+import json
+import tempfile
+import unittest
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from apps.analytics import columnar, counters, dimensions, live
+from apps.analytics.metrics import _realtime_series, full_metrics
+from apps.analytics.models import PageView
+from apps.analytics.tracking import is_bot, is_sampled, sample_weight, sampling_enabled, visitor_hash
+from apps.blog.models import Article
+
+
+def make_view(path="/en/", **kwargs):
+    kwargs.setdefault("visitor_hash", 1)
+    return PageView.objects.create(path_id=dimensions.path_id(path), **kwargs)
+
+
+class TrackingTests(TestCase):
+    def test_visitor_hash_is_a_stable_signed_64_bit_key(self):
+        factory = RequestFactory()
+        a = factory.get("/", REMOTE_ADDR="192.0.2.1", HTTP_USER_AGENT="Firefox")
+        b = factory.get("/other/", REMOTE_ADDR="192.0.2.1", HTTP_USER_AGENT="Firefox")
+        c = factory.get("/", REMOTE_ADDR="192.0.2.1", HTTP_USER_AGENT="Safari")
+        assert visitor_hash(a) == visitor_hash(b) != visitor_hash(c)
+        assert -(2**63) <= visitor_hash(a) < 2**63
+
+    def test_is_bot(self):
+        assert is_bot("")
+        assert is_bot("Mozilla/5.0 (compatible; Googlebot/2.1)")
+        assert not is_bot("Mozilla/5.0 (X11; Linux x86_64) Firefox/128.0")
+
+
+class SamplingTests(TestCase):
+    def setUp(self):
+        dimensions.clear()
+
+    @override_settings(ANALYTICS_SAMPLE_RATE=0.5, ANALYTICS_SAMPLE_RATES={"/en/": 1.0, "/en/blog/": 0.1})
+    def test_longest_prefix_rate_wins(self):
+        assert sample_weight("/fr/") == 2
+        assert sample_weight("/en/about/") == 1
+        assert sample_weight("/en/blog/post/") == 10
+        assert [v for v in range(20) if is_sampled(v, 10)] == [0, 10]
+        assert sampling_enabled()
+        with override_settings(ANALYTICS_SAMPLE_RATE=1.0, ANALYTICS_SAMPLE_RATES={"/en/": 1.0}):
+            assert not sampling_enabled()
+
+    def test_metrics_scale_sampled_rows_back_up(self):
+        make_view("/en/blog/", visitor_hash=1, weight=10)
+        make_view("/en/blog/", visitor_hash=1, weight=10)
+        make_view("/en/", visitor_hash=2)
+        context = {}
+        full_metrics(context)
+        _label, value, _delta, sampled = context["cards"][0]
+        assert (value, sampled) == (21, True)
+        assert context["cards"][3][1] == 11  # unique visitors: 10 + 1
+        assert context["top_pages"][0] == {"path": "/en/blog/", "n": 20}
+
+    def test_sampled_marker_follows_each_card_window(self):
+        pv = make_view("/en/blog/", weight=10)
+        PageView.objects.filter(pk=pv.pk).update(created_at=timezone.now() - timedelta(days=10))
+        make_view("/en/")
+        context = {}
+        full_metrics(context)
+        assert [sampled for *_, sampled in context["cards"][:2]] == [False, True]  # 7 days, 30 days
+
+
+class RealtimeSeriesTests(TestCase):
+    def setUp(self):
+        dimensions.clear()
+
+    def _view(self, minutes_ago):
+        pv = make_view()
+        PageView.objects.filter(pk=pv.pk).update(created_at=timezone.now() - timedelta(minutes=minutes_ago))
+
+    def test_buckets_are_counted_in_sql(self):
+        for minutes_ago in (0, 1, 7, 7, 90):
+            self._view(minutes_ago)
+        series, peak = _realtime_series(PageView.objects.all(), minutes=60, bucket=5)
+        assert len(series) == 12
+        assert sum(s["count"] for s in series) == 4  # the 90-min-old view is outside the window
+        assert series[-1]["count"] == 2
+        assert peak == 2
+
+    def test_bucket_width_is_configurable(self):
+        self._view(0)
+        series, _peak = _realtime_series(PageView.objects.all(), minutes=30, bucket=1)
+        assert len(series) == 30
+        assert series[-1]["span"] == 1
+        assert series[-1]["count"] == 1
+
+
+class DimensionsTests(TestCase):
+    def setUp(self):
+        dimensions.clear()
+
+    def test_values_are_interned_and_resolved_for_the_dashboard(self):
+        for i in range(3):
+            make_view(
+                "/en/blog/",
+                visitor_hash=i,
+                referrer_id=dimensions.referrer_id("news.ycombinator.com"),
+                campaign_id=dimensions.campaign_id("newsletter", "email", ""),
+            )
+        make_view("/en/")
+        make_view("/en/", campaign_id=dimensions.campaign_id("", "email", "spring"))  # no source: not listed
+        assert dimensions.path_id("/en/blog/") == PageView.objects.first().path_id
+        assert dimensions.referrer_id("") is None
+        assert dimensions.campaign_id("", "", "") is None
+
+        context = {}
+        full_metrics(context)
+        assert context["top_pages"][0] == {"path": "/en/blog/", "n": 3}
+        assert context["top_referrers"] == [{"referrer": "news.ycombinator.com", "n": 3}]
+        assert context["top_campaigns"] == [
+            {"utm_source": "newsletter", "utm_medium": "email", "utm_campaign": "", "n": 3}
+        ]
+
+
+class LivePanelTests(TestCase):
+    def setUp(self):
+        dimensions.clear()
+        live._memo.update(data=None, expires=0.0)
+
+    def test_poll_returns_the_shared_snapshot(self):
+        from apps.analytics.views import analytics_live
+
+        make_view("/en/blog/")
+        response = analytics_live(RequestFactory().get("/"))
+        assert response["Cache-Control"] == "no-store"
+        data = json.loads(response.content)
+        assert data["views"] == 1
+        assert data["pages"] == [{"path": "/en/blog/", "n": 1}]
+
+        make_view("/en/")  # not visible until the shared snapshot expires
+        assert live.snapshot() is live.snapshot()
+        assert live.snapshot()["views"] == 1
+
+    @override_settings(ANALYTICS_LIVE_INTERVAL=0)
+    def test_poll_interval_has_a_floor(self):
+        assert live.poll_interval() == live.MIN_LIVE_INTERVAL
+
+
+class PrunePageViewsTests(TestCase):
+    def setUp(self):
+        dimensions.clear()
+
+    def test_archives_then_deletes_in_batches(self):
+        now = timezone.now()
+        for days_ago in (1, 400, 401, 402):
+            pv = make_view(f"/{days_ago}/")
+            PageView.objects.filter(pk=pv.pk).update(created_at=now - timedelta(days=days_ago))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / "old.jsonl.gz"
+            out = StringIO()
+            call_command("prune_pageviews", days=365, batch_size=1, sleep=0, archive=str(archive), stdout=out)
+            with gzip.open(archive, "rt") as fh:
+                rows = [json.loads(line) for line in fh]
+
+        assert sorted(r["path"] for r in rows) == ["/400/", "/401/", "/402/"]
+        assert list(PageView.objects.values_list("path__path", flat=True)) == ["/1/"]
+        assert "Deleted 3 page views" in out.getvalue()
+
+
+class ViewCountersTests(TestCase):
+    def setUp(self):
+        dimensions.clear()
+
+    def test_record_then_refresh_rolling_window(self):
+        article = Article.objects.create(title="Hello", slug="hello")
+        for days_ago in (0, 45):
+            pv = make_view(content_object=article)
+            PageView.objects.filter(pk=pv.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+            counters.record_view(article)
+        article.refresh_from_db()
+        assert (article.view_count, article.views_30d) == (2, 2)
+
+        call_command("refresh_view_counts", stdout=StringIO())
+        article.refresh_from_db()
+        assert (article.view_count, article.views_30d) == (2, 1)
+
+
+class ExportPageViewsTests(TestCase):
+    def setUp(self):
+        dimensions.clear()
+
+    def test_streamed_gzip_matches_plain_export(self):
+        for i in range(3):
+            make_view("/en/blog/", visitor_hash=i % 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            plain, packed = Path(tmp) / "v.csv", Path(tmp) / "v.csv.gz"
+            call_command("export_pageviews", output=str(plain), stderr=StringIO())
+            call_command("export_pageviews", output=str(packed), stderr=StringIO())
+            assert gzip.decompress(packed.read_bytes()) == plain.read_bytes()
+            assert len(plain.read_text().splitlines()) == 4
+
+            daily = Path(tmp) / "d.jsonl"
+            call_command("export_pageviews", output=str(daily), daily=True, stderr=StringIO())
+            row = json.loads(daily.read_text())
+        assert (row["path"], row["views"], row["visitors"]) == ("/en/blog/", 3, 2)
+
+    def test_date_range_bounds_local_days(self):
+        from apps.analytics.export import date_range, day_start
+
+        today = timezone.localdate()
+        for at in (day_start(today) - timedelta(microseconds=1), day_start(today), timezone.now()):
+            pv = make_view()
+            PageView.objects.filter(pk=pv.pk).update(created_at=at)
+        assert date_range(PageView.objects.all(), since=today).count() == 2
+        assert date_range(PageView.objects.all(), until=today - timedelta(days=1)).count() == 1
+
+    def test_malformed_date_is_rejected(self):
+        from apps.analytics.views import analytics_export
+
+        for query in ({"since": "yesterday"}, {"until": "2025-02-30"}):
+            assert analytics_export(RequestFactory().get("/", query)).status_code == 400
+        assert analytics_export(RequestFactory().get("/", {"since": ""})).status_code == 200
+
+
+@unittest.skipUnless(importlib.util.find_spec("duckdb"), "duckdb not installed")
+class ColumnarArchiveTests(TestCase):
+    def setUp(self):
+        dimensions.clear()
+        cache.delete(columnar.CACHE_KEY)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.enterContext(override_settings(ANALYTICS_ARCHIVE_DIR=tmp.name))
+
+    def test_archived_days_feed_long_range_cards_once(self):
+        for days_ago in (0, 2, 2, 400):
+            pv = make_view(f"/{days_ago}/")
+            PageView.objects.filter(pk=pv.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        call_command("archive_pageviews", stdout=StringIO())
+        call_command("archive_pageviews", stdout=StringIO())  # idempotent
+
+        assert sum(columnar.archived_days().values()) == 3  # today is never archived
+        # The cutoff day (today) is not archived: nothing goes.
+        with self.assertRaises(CommandError):  # noqa: PT027 - Django TestCase, no pytest here
+            call_command("prune_pageviews", days=0, sleep=0, stdout=StringIO())
+        assert PageView.objects.count() == 4
+        call_command("prune_pageviews", days=1, sleep=0, stdout=StringIO())
+        assert PageView.objects.count() == 1
+        assert columnar.long_range()["all_time"] == 4
@@ -1,14 +1,76 @@
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.template.response import TemplateResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.utils.translation import gettext_lazy as _
 
 
 def analytics_view(request):
     """Dedicated Analytics admin page. Mounted on the admin site (staff-only,
     behind the 2FA gate) via ``admin_view`` — see EskozAdminSite.get_urls."""
+    from apps.analytics.live import poll_interval
     from apps.analytics.metrics import full_metrics
     from apps.core.admin.site import admin_site
 
     context = admin_site.each_context(request)
     context["title"] = _("Analytics")
+    context["live_interval"] = poll_interval()
     full_metrics(context)
     return TemplateResponse(request, "admin/analytics.html", context)
+
+
+def analytics_live(request):
+    """JSON snapshot of the "Last hour" panel, polled by the page (see ``live``).
+    Staff-only like the page itself: mounted through ``admin_view``."""
+    from apps.analytics.live import snapshot
+
+    response = JsonResponse(snapshot())
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def _parse_day(value):
+    """``parse_date`` that raises ``ValueError`` instead of ignoring a malformed value."""
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(value)
+    return day
+
+
+def analytics_export(request):
+    """Stream page views (or the daily rollup) as CSV / JSONL download.
+
+    Query string: ``since`` / ``until`` (``YYYY-MM-DD``, inclusive; anything
+    else is a 400), ``format`` (``csv`` | ``jsonl``), ``kind`` (``views`` |
+    ``daily``) and ``gzip=1``. Rows are streamed straight from a database cursor, so the
+    response size is not bounded by memory.
+    """
+    from apps.analytics import export
+    from apps.analytics.models import PageView
+
+    fmt = request.GET.get("format", "csv")
+    kind = request.GET.get("kind", "views")
+    if fmt not in export.FORMATS or kind not in ("views", "daily"):
+        return HttpResponseBadRequest("Invalid format or kind")
+    try:
+        since, until = (_parse_day(request.GET.get(key)) for key in ("since", "until"))
+    except ValueError:
+        return HttpResponseBadRequest("Invalid date")
+    compress = request.GET.get("gzip") == "1"
+
+    queryset = export.date_range(PageView.objects.all(), since, until)
+    if kind == "daily":
+        rows, fields = export.iter_daily(queryset), export.DAILY_FIELDS
+    else:
+        rows, fields = export.iter_rows(queryset), export.FIELDS
+
+    filename = f"pageviews-{kind}-{timezone.localdate():%Y%m%d}.{fmt}" + (".gz" if compress else "")
+    content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    response = StreamingHttpResponse(
+        export.iter_bytes(rows, fmt, fields, compress=compress),
+        content_type="application/gzip" if compress else f"{content_type}; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
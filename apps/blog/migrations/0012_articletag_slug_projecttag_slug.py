@@ -0,0 +1,36 @@
+# Generated by Django 6.0.4 on 2026-10-19 17:30
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    for name in ("ArticleTag", "ProjectTag"):
+        Tag = apps.get_model("blog", name)
+        tags = list(Tag.objects.all())
+        for tag in tags:
+            tag.slug = slugify(tag.title)
+        Tag.objects.bulk_update(tags, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_articletranslation_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="articletag",
+            name="slug",
+            field=models.SlugField(default="", editable=False, max_length=255, verbose_name="Slug"),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="projecttag",
+            name="slug",
+            field=models.SlugField(default="", editable=False, max_length=255, verbose_name="Slug"),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.4 on 2026-10-19 18:10
+
+from django.db import migrations, models
+
+
+def count_posts(apps, schema_editor):
+    from apps.core.tags import refresh_counts
+
+    for name in ("ArticleTag", "ProjectTag"):
+        refresh_counts(apps.get_model("blog", name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_articletag_slug_projecttag_slug"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="articletag",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Posts"),
+        ),
+        migrations.AddField(
+            model_name="projecttag",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Posts"),
+        ),
+        migrations.RunPython(count_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.4 on 2026-10-19 16:09
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def reslug(apps, schema_editor):
+    """Recompute slugs keeping Unicode letters (they were empty for e.g. "日本")."""
+    for name in ("ArticleTag", "ProjectTag"):
+        Tag = apps.get_model("blog", name)
+        tags = list(Tag.objects.all())
+        for tag in tags:
+            tag.slug = slugify(tag.title, allow_unicode=True)
+        Tag.objects.bulk_update(tags, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0013_tag_post_count"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="articletag",
+            name="slug",
+            field=models.SlugField(allow_unicode=True, editable=False, max_length=255, verbose_name="Slug"),
+        ),
+        migrations.AlterField(
+            model_name="projecttag",
+            name="slug",
+            field=models.SlugField(allow_unicode=True, editable=False, max_length=255, verbose_name="Slug"),
+        ),
+        migrations.RunPython(reslug, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import article_detail, article_list, member_list, project_list
+from .views import article_cards, article_detail, article_list, member_list, project_list
 
 app_name = "blog"
 urlpatterns = [
@@ -11,6 +11,7 @@ urlpatterns = [
     ),
     path("articles/<slug:slug>/", article_list, name="article_category_list"),
     path("articles/", article_list, name="article_list"),
+    path("fragments/articles/", article_cards, name="article_cards"),
     path("projects/", project_list, name="project_list"),
     path("members/", member_list, name="member_list"),
 ]
@@ -1,8 +1,12 @@
 from django.contrib.auth.models import User
 from django.shortcuts import Http404, get_object_or_404, render
+from django.urls import reverse
 
 from apps.core.decorators import feature_active_required
-from apps.core.views import group_by_year, paginate_queryset, redirect_to_available_translation
+from apps.core.listings import category_summary, post_archive
+from apps.core.pagination import link_pages, paginate_keyset
+from apps.core.related import related_posts
+from apps.core.views import group_by_year, redirect_to_available_translation, render_cards
 
 from .models import Article, Category, Project
 
@@ -30,28 +34,11 @@ def article_detail(request, slug_category, slug_article):
     if redirect_response is not None:
         return redirect_response
 
-    related = list(
-        Article.objects.filter(visibility="public", category=category)
-        .exclude(pk=article.pk)
-        .select_related("category")
-        .order_by("-published_on")[:4]
-    )
-    if len(related) < 4:
-        # Top up with recent public articles outside this category so the
-        # "See also" block always has at least a few suggestions.
-        seen = {a.pk for a in related} | {article.pk}
-        fill = (
-            Article.objects.filter(visibility="public")
-            .exclude(pk__in=seen)
-            .select_related("category")
-            .order_by("-published_on")[: 4 - len(related)]
-        )
-        related += list(fill)
+    related = related_posts(article)
 
     context = {
         "article": article,
         "related_posts": related,
-        "related_post_url_name": "blog:article_detail",
     }
 
     if article.visibility == "protected":
@@ -86,18 +73,20 @@ def article_list(request, slug=None):
         selected_category = get_object_or_404(Category, slug=slug)
         articles = articles.filter(category=selected_category)
 
-    categories = Category.objects.filter(articles__isnull=False, articles__visibility="public").distinct()
+    categories = category_summary(Article)
 
     # Below the threshold we render the whole archive grouped by year
     # (no pagination, no per-page selector). Past the threshold we keep
     # standard pagination but still group within each page.
     GROUP_THRESHOLD = 40
-    total = articles.count()
-    if total <= GROUP_THRESHOLD:
+    archive = post_archive(articles.model, selected_category)
+    if archive.count <= GROUP_THRESHOLD:
         page_obj = None
-        groups = group_by_year(articles)
+        groups = archive.groups(articles)
+        articles = [post for group in groups for post in group["items"]]
     else:
-        page_obj = paginate_queryset(request, articles)
+        page_obj = paginate_keyset(request, articles, "published_on")
+        link_pages(page_obj, request, fragment_path=reverse("blog:article_cards"), category=slug)
         groups = group_by_year(page_obj.object_list)
 
     return render(
@@ -113,6 +102,29 @@ def article_list(request, slug=None):
     )
 
 
+@feature_active_required(module_name="blog", feature_name="articles")
+def article_cards(request):
+    """
+    Render the next batch of article cards for the list's infinite scroll.
+
+    Args:
+        request (HttpRequest): The HTTP request object; ``?after=`` cursor,
+            optional ``?category=`` slug.
+
+    Returns:
+        HttpResponse: Bare cards followed by the pagination nav.
+    """
+    articles = (
+        Article.objects.filter(visibility="public").select_related("category").prefetch_related("translations", "tags")
+    )
+    slug = request.GET.get("category")
+    page_path = reverse("blog:article_list")
+    if slug:
+        articles = articles.filter(category=get_object_or_404(Category, slug=slug))
+        page_path = reverse("blog:article_category_list", args=[slug])
+    return render_cards(request, articles, "published_on", "article", page_path, category=slug)
+
+
 @feature_active_required(module_name="blog", feature_name="members")
 def member_list(request):
     """
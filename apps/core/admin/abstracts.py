@@ -1,6 +1,5 @@
 from django.contrib import admin, messages
 from django.core.exceptions import ValidationError
-from django.db.models import Count
 from django.utils.html import format_html, format_html_join
 from django.utils.translation import gettext_lazy as _
 from unfold.admin import GenericTabularInline, ModelAdmin, StackedInline
@@ -69,16 +68,12 @@ class AbstractPostTranslationAdmin(AbstractTranslatableMarkdownItemTranslationAd
 
 
 class PageViewsAdminMixin:
-    """Adds a sortable "Views" column from the analytics ``page_views``
-    GenericRelation. The model must declare ``page_views =
-    GenericRelation("analytics.PageView")``."""
+    """Adds a sortable "Views" column from the denormalised ``view_count``
+    field (kept up to date by ``apps.analytics.counters``)."""
 
-    def get_queryset(self, request):
-        return super().get_queryset(request).annotate(_views=Count("page_views"))
-
-    @admin.display(description=_("Views"), ordering="_views")
+    @admin.display(description=_("Views"), ordering="view_count")
     def views_count(self, obj):
-        return getattr(obj, "_views", 0)
+        return obj.view_count
 
 
 class AuthorsAdminMixin:
@@ -103,7 +98,7 @@ class AuthorsAdminMixin:
             form.instance.authors.add(request.user)
 
 
-class AbstractPostAdmin(AuthorsAdminMixin, AbstractTranslatableMarkdownItemAdmin):
+class AbstractPostAdmin(PageViewsAdminMixin, AuthorsAdminMixin, AbstractTranslatableMarkdownItemAdmin):
     """Base admin for all Post-like models."""
 
     abstract = True
@@ -119,11 +114,7 @@ class AbstractPostAdmin(AuthorsAdminMixin, AbstractTranslatableMarkdownItemAdmin
     readonly_fields = ["edited_on"]
 
     def get_queryset(self, request):
-        return super().get_queryset(request).prefetch_related("translations").annotate(_views=Count("page_views"))
-
-    @admin.display(description=_("Views"), ordering="_views")
-    def views_count(self, obj):
-        return obj._views
+        return super().get_queryset(request).prefetch_related("translations")
 
     @admin.display(description=_("Languages"))
     def languages_list(self, obj):
@@ -208,6 +199,9 @@ class AbstractCategoryTranslationAdmin(StackedInline):
 class AbstractTagAdmin(ModelAdmin):
     abstract = True
 
+    # ``post_count`` is denormalised (``apps.core.tags.refresh_counts``), so
+    # the column costs no join.
+    list_display = ("title", "slug", "post_count")
     search_fields = ["title"]
 
 
@@ -43,7 +43,7 @@ class EskozAdminSite(UnfoldAdminSite):
         return filtered_apps
 
     def get_urls(self):
-        from apps.analytics.views import analytics_view
+        from apps.analytics.views import analytics_export, analytics_live, analytics_view
         from apps.core.views import verify_2fa_view
 
         urls = super().get_urls()
@@ -53,6 +53,16 @@ class EskozAdminSite(UnfoldAdminSite):
                 self.admin_view(analytics_view),
                 name="analytics",
             ),
+            path(
+                "analytics/live/",
+                self.admin_view(analytics_live),
+                name="analytics_live",
+            ),
+            path(
+                "analytics/export/",
+                self.admin_view(analytics_export),
+                name="analytics_export",
+            ),
             path(
                 "content_preview/",
                 self.admin_view(self.content_preview),
@@ -0,0 +1,87 @@
+"""Search-as-you-type title completions for the search box.
+
+Each worker process keeps, per language, a sorted list with one entry per
+word start of every public post title, so both "kerb" and "expl" complete
+"Kerberoasting explained". A prefix is answered with a ``bisect`` and a short
+scan: no query besides the cache read of the search-index generation
+(``apps.core.search.generation``). Translation and post saves bump that
+generation, and the next request in each process then rebuilds its list
+for the language.
+"""
+
+import bisect
+import threading
+
+from django.utils import translation
+
+from apps.core.search import POST_TYPES, RELATED, generation
+
+MAX_RESULTS = 8
+MIN_PREFIX = 2
+# Matching entries looked at per request, so a two-letter prefix on a large
+# site stays cheap; title starts sort first within it.
+SCAN_LIMIT = 200
+
+_lock = threading.Lock()
+_indexes = {}  # language -> (generation, keys, entries)
+
+
+def _build(language):
+    """``(keys, entries)`` for ``language``, both sorted by key."""
+    entries = []
+    with translation.override(language):
+        for key, post_model, translation_model in POST_TYPES:
+            translations = (
+                translation_model.objects.filter(language=language)
+                .select_related("translatable_content", *RELATED.get(key, ()))
+                .defer("content", "search_vector")
+            )
+            if hasattr(post_model, "visibility"):
+                translations = translations.filter(translatable_content__visibility="public")
+            for t in translations:
+                item = {"title": t.title, "url": t.translatable_content.get_absolute_url(), "type": key}
+                folded = t.title.casefold()
+                words = folded.split()
+                start = 0
+                for position, word in enumerate(words):
+                    start = folded.index(word, start)
+                    entries.append((folded[start:], position, item))
+                    start += len(word)
+    entries.sort(key=lambda e: (e[0], e[1]))
+    return [e[0] for e in entries], entries
+
+
+def _index(language):
+    current = generation()
+    with _lock:
+        cached = _indexes.get(language)
+        if cached is None or cached[0] != current:
+            cached = (current, *_build(language))
+            _indexes[language] = cached
+        return cached[1], cached[2]
+
+
+def complete(prefix: str, language: str, limit: int = MAX_RESULTS) -> list[dict]:
+    """Public posts whose title has a word starting with ``prefix``.
+
+    Returns ``{"title", "url", "type"}`` dicts, titles that start with the
+    prefix first, then alphabetically.
+    """
+    prefix = " ".join(prefix.casefold().split())
+    if len(prefix) < MIN_PREFIX:
+        return []
+    keys, entries = _index(language)
+    start = bisect.bisect_left(keys, prefix)
+    matches = []
+    for key, position, item in entries[start : start + SCAN_LIMIT]:
+        if not key.startswith(prefix):
+            break
+        matches.append((position > 0, item["title"].casefold(), item))
+    results, seen = [], set()
+    for _, _, item in sorted(matches, key=lambda m: m[:2]):
+        if item["url"] not in seen:
+            seen.add(item["url"])
+            results.append(item)
+            if len(results) == limit:
+                break
+    return results
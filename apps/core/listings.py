@@ -0,0 +1,114 @@
+"""Cached shape of the article and writeup lists.
+
+``post_archive`` returns the public posts of a model (optionally of one
+category) as year buckets of ids, newest first. ``category_summary`` returns
+the categories holding public posts of a model, with their count and title
+in the active language, for the category picker. Both are cached under a
+per-model version that ``apps.core.signals`` bumps on every post, category
+or category translation save/delete. A list view thus learns its total, its
+year grouping (for a small archive) and its categories from the cache, and
+only queries the posts it displays.
+"""
+
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.utils.translation import get_language
+
+ARCHIVE_CACHE_TTL = 60 * 60 * 24
+
+
+@dataclass
+class Archive:
+    years: list  # [(year or None, [pk, ...]), ...], newest first
+
+    @property
+    def count(self) -> int:
+        return sum(len(ids) for _, ids in self.years)
+
+    def groups(self, queryset):
+        """``group_by_year``-shaped buckets of ``queryset``'s posts, in one query."""
+        posts = queryset.in_bulk([pk for _, ids in self.years for pk in ids])
+        groups = [{"year": year, "items": [posts[pk] for pk in ids if pk in posts]} for year, ids in self.years]
+        return [group for group in groups if group["items"]]
+
+
+@dataclass(frozen=True)
+class CategorySummary:
+    id: int
+    slug: str
+    title: str
+    count: int
+
+
+def _version_key(model):
+    return f"lists:{model._meta.label_lower}:version"
+
+
+def _version(model) -> int:
+    # Seeded from the clock, like the search generation, so an evicted
+    # version never comes back at a value older entries were stored under.
+    value = cache.get(_version_key(model))
+    if value is None:
+        cache.add(_version_key(model), time.time_ns(), None)
+        value = cache.get(_version_key(model), 0)
+    return value
+
+
+def bump_version(model) -> None:
+    """Invalidate every cached archive of ``model``."""
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), time.time_ns(), None)
+
+
+def post_archive(model, category=None) -> Archive:
+    """Public posts of ``model`` (in ``category``) as year buckets of ids."""
+    key = f"lists:{model._meta.label_lower}:{category.pk if category else 'all'}:{_version(model)}"
+    years = cache.get(key)
+    if years is None:
+        posts = model.objects.filter(visibility="public")
+        if category is not None:
+            posts = posts.filter(category=category)
+        years = []
+        for pk, published_on in posts.order_by(F("published_on").desc(nulls_first=True), "-pk").values_list(
+            "pk", "published_on"
+        ):
+            year = published_on.year if published_on else None
+            if not years or years[-1][0] != year:
+                years.append((year, []))
+            years[-1][1].append(pk)
+        cache.set(key, years, ARCHIVE_CACHE_TTL)
+    return Archive(years)
+
+
+def _translated_title(category, language):
+    """``category.get_translation(language).title`` from prefetched translations."""
+    translations = sorted(category.translations.all(), key=lambda t: t.pk)
+    for candidates in (
+        [t for t in translations if t.language == language],
+        [t for t in translations if t.language == "en"],
+        translations,
+    ):
+        if candidates:
+            return candidates[0].title
+    return category.title
+
+
+def category_summary(post_model, language=None) -> list[CategorySummary]:
+    """Categories with public ``post_model`` posts, titled in ``language`` (default: active)."""
+    language = language or get_language()
+    key = f"lists:{post_model._meta.label_lower}:categories:{language}:{_version(post_model)}"
+    summary = cache.get(key)
+    if summary is None:
+        counts = dict(
+            post_model.objects.filter(visibility="public").values_list("category").annotate(n=Count("pk")).order_by()
+        )
+        category_model = post_model._meta.get_field("category").related_model
+        categories = category_model.objects.filter(pk__in=counts).prefetch_related("translations").order_by("pk")
+        summary = [CategorySummary(c.pk, c.slug, _translated_title(c, language), counts[c.pk]) for c in categories]
+        cache.set(key, summary, ARCHIVE_CACHE_TTL)
+    return summary
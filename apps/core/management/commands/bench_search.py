@@ -0,0 +1,168 @@
+"""Benchmark search latency and relevance on a seeded corpus.
+
+Seeds the labelled documents of a judgment file (``apps/core/search_judgments.json``
+by default) plus ``--posts`` filler articles, writeups and lessons per
+language, then runs every judged query through ``search_posts`` and reports,
+per query and overall, p50/p95 latency, SQL queries issued per search, and
+recall@k and reciprocal rank against the judgments:
+
+    python manage.py bench_search --posts 500 --languages en,fr --runs 10
+
+Run it once per settings module to compare backends (the report names the
+active one). Everything happens inside a transaction that is rolled back, so
+it can be pointed at a development database without leaving rows behind;
+existing content there does compete in the rankings. The result cache is
+bypassed unless ``--cached`` is given.
+"""
+
+import json
+import math
+import random
+import statistics
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.blog.models import Article, ArticleTranslation
+from apps.core import search
+from apps.education.models import Course, Lesson, LessonTranslation, Module
+from apps.infosec.models import Writeup, WriteupTranslation
+
+DEFAULT_JUDGMENTS = Path(search.__file__).with_name("search_judgments.json")
+DEFAULT_POSTS = 200
+DEFAULT_LANGUAGES = "en,fr"
+DEFAULT_RUNS = 5
+DEFAULT_K = 10
+DEFAULT_SEED = 1
+
+
+class Command(BaseCommand):
+    help = "Measure search latency, queries issued, recall and MRR on a seeded corpus."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=DEFAULT_POSTS,
+            help=f"Filler posts per type and language (default {DEFAULT_POSTS}).",
+        )
+        parser.add_argument(
+            "--languages",
+            default=DEFAULT_LANGUAGES,
+            help=f"Comma-separated filler languages (default {DEFAULT_LANGUAGES}).",
+        )
+        parser.add_argument(
+            "--runs", type=int, default=DEFAULT_RUNS, help=f"Timed runs per query (default {DEFAULT_RUNS})."
+        )
+        parser.add_argument("--k", type=int, default=DEFAULT_K, help=f"Cut-off for recall@k (default {DEFAULT_K}).")
+        parser.add_argument("--judgments", default=str(DEFAULT_JUDGMENTS), help="Judgment file (JSON).")
+        parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed of the filler corpus.")
+        parser.add_argument("--cached", action="store_true", help="Keep the result cache on (warm-path timings).")
+
+    def handle(self, *args, **options):
+        try:
+            judgments = json.loads(Path(options["judgments"]).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read judgments: {exc}") from exc
+        languages = [code.strip() for code in options["languages"].split(",") if code.strip()]
+        cache = nullcontext() if options["cached"] else override_settings(SEARCH_CACHE_TIMEOUT=0)
+
+        with transaction.atomic(), cache:
+            start = time.perf_counter()
+            posts = self._seed(judgments, languages, options["posts"], random.Random(options["seed"]))
+            self.stdout.write(
+                f"backend: {connection.vendor}, {posts} posts seeded in {time.perf_counter() - start:.1f}s, "
+                f"{len(judgments['queries'])} queries x {options['runs']} runs, "
+                f"cache {'on' if options['cached'] else 'off'}"
+            )
+            self._bench(judgments["queries"], options["runs"], options["k"])
+            transaction.set_rollback(True)
+
+    def _seed(self, judgments, languages, filler, rng):
+        """Create the judged documents and the filler corpus; returns the post count."""
+        course = Course.objects.create(title="Bench", slug="bench-course")
+        module = Module.objects.create(course=course, title="Bench", slug="bench-module")
+        models = {
+            "articles": (Article, ArticleTranslation, {}),
+            "writeups": (Writeup, WriteupTranslation, {}),
+            "lessons": (Lesson, LessonTranslation, {"module": module}),
+        }
+        docs = {key: [] for key in models}
+        for doc in judgments["documents"]:
+            kind, slug = doc["key"].split("/")
+            docs[kind].append((slug, doc["translations"]))
+        vocabulary = judgments["filler_vocabulary"]
+        for kind in models:
+            for i in range(filler):
+                translations = {
+                    lang: {
+                        "title": _words(rng, vocabulary, 5).capitalize(),
+                        "description": _words(rng, vocabulary, 12),
+                        "content": _words(rng, vocabulary, 250),
+                    }
+                    for lang in languages
+                }
+                docs[kind].append((f"bench-filler-{kind}-{i}", translations))
+
+        total = 0
+        for kind, (post_model, translation_model, extra) in models.items():
+            posts = post_model.objects.bulk_create(
+                [post_model(title=slug, slug=slug, **extra) for slug, _ in docs[kind]], batch_size=500
+            )
+            translation_model.objects.bulk_create(
+                [
+                    translation_model(translatable_content=post, language=lang, **fields)
+                    for post, (_, translations) in zip(posts, docs[kind], strict=True)
+                    for lang, fields in translations.items()
+                ],
+                batch_size=500,
+            )
+            search.reindex(translation_model)
+            total += len(posts)
+        search.bump_generation()
+        return total
+
+    def _bench(self, queries, runs, k):
+        latencies, query_counts, recalls, reciprocal_ranks = [], [], [], []
+        self.stdout.write(
+            f"{'query':<28} {'lang':<5} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {f'recall@{k}':>10} {'RR':>6}"
+        )
+        for judged in queries:
+            timings = []
+            for _ in range(runs):
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    results = search.search_posts(judged["query"], judged["language"], limit=k)
+                    timings.append((time.perf_counter() - start) * 1000)
+            found = [f"{hit.kind}/{hit.post.slug}" for hit in results.hits]
+            relevant = set(judged["relevant"])
+            recall = len(relevant.intersection(found)) / len(relevant) if relevant else 1.0
+            rr = next((1 / rank for rank, key in enumerate(found, 1) if key in relevant), 0.0)
+            latencies += timings
+            query_counts.append(len(captured.captured_queries))
+            recalls.append(recall)
+            reciprocal_ranks.append(rr)
+            self.stdout.write(
+                f"{judged['query'][:28]:<28} {judged['language']:<5} {_percentile(timings, 50):8.2f} "
+                f"{_percentile(timings, 95):8.2f} {len(captured.captured_queries):8d} {recall:10.2f} {rr:6.2f}"
+            )
+        self.stdout.write(
+            f"{'overall':<34} {_percentile(latencies, 50):8.2f} {_percentile(latencies, 95):8.2f} "
+            f"{statistics.mean(query_counts):8.1f} {statistics.mean(recalls):10.2f} "
+            f"{statistics.mean(reciprocal_ranks):6.2f}  (MRR)"
+        )
+
+
+def _words(rng, vocabulary, n):
+    return " ".join(rng.choices(vocabulary, k=n))
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
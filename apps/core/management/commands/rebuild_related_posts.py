@@ -0,0 +1,20 @@
+"""Recompute the "Related posts" lists of every article and writeup.
+
+Saves keep the lists in step as content changes (``apps.core.related``), but
+the recency part of the score drifts with time. Run on a schedule (cron),
+e.g. daily, and once after deploying to fill the table:
+
+    python manage.py rebuild_related_posts
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core import related
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed related posts of every article and writeup."
+
+    def handle(self, *args, **options):
+        posts = related.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Related posts rebuilt for {posts} posts."))
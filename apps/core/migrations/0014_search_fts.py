@@ -0,0 +1,46 @@
+# Generated by Django 6.0.4 on 2026-10-19 16:05
+
+from django.db import migrations
+
+# (translation table, kind) — kind is the post type's index in
+# ``apps.core.search.POST_TYPES``; row ids are ``id * 4 + kind``.
+SOURCES = (
+    ("blog_articletranslation", 0),
+    ("infosec_writeuptranslation", 1),
+    ("education_lessontranslation", 2),
+)
+
+
+def create_fts_table(apps, schema_editor):
+    """Create and fill the FTS5 search table (SQLite only)."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS core_search_fts USING fts5("
+        "title, description, content, language UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute("DELETE FROM core_search_fts")
+    for table, kind in SOURCES:
+        schema_editor.execute(
+            "INSERT INTO core_search_fts (rowid, title, description, content, language) "  # noqa: S608
+            f"SELECT id * 4 + {kind}, title, coalesce(description, ''), content, language FROM {table}"
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS core_search_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_alter_translatablemarkdownitemimage_picture"),
+        ("blog", "0011_articletranslation_search_vector"),
+        ("education", "0006_lessontranslation_search_vector"),
+        ("infosec", "0015_writeuptranslation_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.4 on 2026-10-19 16:40
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Columns "did you mean" suggestions are matched against (apps.core.search.suggest).
+TRIGRAM_COLUMNS = (
+    ("blog_articletranslation", "title"),
+    ("infosec_writeuptranslation", "title"),
+    ("education_lessontranslation", "title"),
+    ("blog_articletag", "title"),
+    ("infosec_writeuptag", "title"),
+    ("infosec_cve", "cve_id"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """GIN trigram indexes for the fuzzy suggestions (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_search_fts"),
+        ("infosec", "0015_writeuptranslation_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 6.0.4 on 2026-10-19 17:20
+
+import heapq
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+# apps.core.related when this migration was written: migrations must not
+# import live code.
+RELATED_COUNT = 4
+TAG_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.5
+RECENCY_WEIGHT = 0.25
+RECENCY_HALF_LIFE_DAYS = 180
+RELATED_TYPES = (("blog", "Article", "article"), ("infosec", "Writeup", "writeup"))
+
+
+def _score(source, candidate, now):
+    union = source["tags"] | candidate["tags"]
+    score = TAG_WEIGHT * len(source["tags"] & candidate["tags"]) / len(union) if union else 0.0
+    if source["category"] and source["category"] == candidate["category"]:
+        score += CATEGORY_WEIGHT
+    if candidate["published_on"]:
+        age = max((now - candidate["published_on"]).total_seconds(), 0) / 86400
+        score += RECENCY_WEIGHT * 0.5 ** (age / RECENCY_HALF_LIFE_DAYS)
+    return score
+
+
+def fill_related_posts(apps, schema_editor):
+    """Compute every list once, as ``related.rebuild`` does, so detail pages
+    are not left without related posts until the first save."""
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    RelatedPost = apps.get_model("core", "RelatedPost")
+    posts, targets = {}, {}
+    for app_label, model_name, target in RELATED_TYPES:
+        model = apps.get_model(app_label, model_name)
+        type_id = ContentType.objects.get_or_create(app_label=app_label, model=model_name.lower())[0].pk
+        targets[type_id] = target
+        rows = model.objects.values_list("pk", "visibility", "category__slug", "published_on", "tags__slug")
+        for pk, visibility, category, published_on, tag in rows:
+            post = posts.setdefault(
+                (type_id, pk),
+                {
+                    "public": visibility == "public",
+                    "category": category if category != "undefined" else None,
+                    "published_on": published_on,
+                    "tags": set(),
+                },
+            )
+            if tag:
+                post["tags"].add(tag)
+
+    now = timezone.now()
+    rows = []
+    for key, source in posts.items():
+        scored = (
+            (_score(source, post, now), other) for other, post in posts.items() if post["public"] and other != key
+        )
+        best = heapq.nlargest(RELATED_COUNT, scored, key=lambda item: (item[0], item[1][1]))
+        rows.extend(
+            RelatedPost(
+                source_type_id=key[0],
+                source_id=key[1],
+                rank=rank,
+                score=score,
+                **{f"{targets[type_id]}_id": pk},
+            )
+            for rank, (score, (type_id, pk)) in enumerate(best)
+        )
+    RelatedPost.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_articletag_slug_projecttag_slug"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0015_search_trigram"),
+        ("infosec", "0016_writeuptag_slug"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPost",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("source_id", models.PositiveIntegerField()),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                (
+                    "article",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="blog.article",
+                    ),
+                ),
+                (
+                    "source_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="contenttypes.contenttype"
+                    ),
+                ),
+                (
+                    "writeup",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="infosec.writeup",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Related post",
+                "verbose_name_plural": "Related posts",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source_type", "source_id", "rank"), name="core_relatedpost_source_rank"
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("article__isnull", True), ("writeup__isnull", True), _connector="XOR"),
+                        name="core_relatedpost_one_target",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(fill_related_posts, migrations.RunPython.noop),
+    ]
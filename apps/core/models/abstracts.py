@@ -3,6 +3,7 @@ from django.contrib.auth.hashers import check_password, identify_hasher, make_pa
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchVectorField
 from django.core import checks
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -165,6 +166,8 @@ class AbstractTranslatableMarkdownItemTranslation(models.Model):
         title (CharField): Translated title.
         description (TextField): Short description of the translatable markdown item content.
         content (TextField): Full translatable markdown item content in the specified language.
+        search_vector (SearchVectorField): Weighted tsvector of title/description/content,
+            maintained by a post_save signal (PostgreSQL only; stays NULL elsewhere).
     """
 
     translatable_content = models.ForeignKey(
@@ -177,6 +180,7 @@ class AbstractTranslatableMarkdownItemTranslation(models.Model):
     title = models.CharField(max_length=255, verbose_name=_("Title"))
     description = models.TextField(max_length=512, blank=True, null=True, verbose_name=_("Description"))
     content = models.TextField(verbose_name=_("Content"))
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def get_reading_time(self):
         """
@@ -241,6 +245,9 @@ class AbstractPost(AbstractTranslatableMarkdownItem):
     )
     password = models.CharField(max_length=128, null=True, blank=True, verbose_name=_("Password"))
     page_views = GenericRelation("analytics.PageView")
+    # Denormalised from page_views (see apps.analytics.counters) so changelists never count the table.
+    view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Views"))
+    views_30d = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Views (30 days)"))
 
     def _password_is_hashed(self):
         """Return True if self.password is already a hashed value."""
@@ -333,9 +340,24 @@ class AbstractTag(models.Model):
 
     Attributes:
         title (CharField): The unique name of the tag.
+        slug (SlugField): ``slugify(title)`` (Unicode letters kept, so "日本"
+            has a page too), kept on save. Not unique: tags of different
+            models (or spellings) sharing a slug share a tag page. Empty for
+            titles without a letter or digit; those tags get no page.
+        post_count (PositiveIntegerField): Public posts carrying the tag,
+            denormalised by ``apps.core.tags.refresh_counts``.
     """
 
     title = models.CharField(max_length=255, unique=True)
+    slug = models.SlugField(max_length=255, allow_unicode=True, editable=False, verbose_name=_("Slug"))
+    # Kept up to date on post and tag changes (see apps.core.signals) so the
+    # tag cloud and the admin changelists never count the join.
+    post_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Posts"))
+
+    def save(self, *args, **kwargs):
+        """Derive the slug from the title, then save the tag."""
+        self.slug = slugify(self.title, allow_unicode=True)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """Return the title of the tag as its string representation."""
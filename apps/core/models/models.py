@@ -4,6 +4,7 @@ import pyotp
 import qrcode
 import qrcode.image.svg
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -90,3 +91,35 @@ class UserLink(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.user.username}"
+
+
+class RelatedPost(models.Model):
+    """One precomputed "Related posts" entry of an article or writeup.
+
+    ``source`` is any post (generic, like ``PageView``); the target is an
+    article or a writeup, as a real foreign key so a detail page loads its
+    list with ``select_related``. Maintained by ``apps.core.related``.
+    """
+
+    source_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name="+")
+    source_id = models.PositiveIntegerField()
+    rank = models.PositiveSmallIntegerField()
+    article = models.ForeignKey("blog.Article", on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    writeup = models.ForeignKey("infosec.Writeup", on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    score = models.FloatField()
+
+    @property
+    def post(self):
+        return self.article or self.writeup
+
+    class Meta:
+        verbose_name = _("Related post")
+        verbose_name_plural = _("Related posts")
+        constraints = [
+            # Also the index behind the detail-page lookup.
+            models.UniqueConstraint(fields=["source_type", "source_id", "rank"], name="core_relatedpost_source_rank"),
+            models.CheckConstraint(
+                condition=models.Q(article__isnull=True) ^ models.Q(writeup__isnull=True),
+                name="core_relatedpost_one_target",
+            ),
+        ]
@@ -0,0 +1,164 @@
+"""Keyset (cursor) pagination for the post and CVE lists.
+
+``Paginator`` pages with ``OFFSET``, which gets slower the deeper the page,
+and runs a ``COUNT(*)`` on every request. ``paginate_keyset`` orders by a
+date column then ``id`` (both descending, undated rows first as PostgreSQL
+does by default, so the ``(visibility, -published_on)`` and CVE
+``(-published_date, -id)`` indexes serve it) and fetches one row past the
+page: the rows after the last one shown, or before the first one, are a
+range scan on that index.
+
+Page links carry an opaque token (``?after=`` / ``?before=``) next to the
+page number, so the canonical URL stays ``?page=N`` (the ``seo`` context
+processor drops the token). A bare ``?page=N``, as a crawler or the
+canonical link sends it, is still served with ``OFFSET``, without a count;
+only an out-of-range page counts, to fall back to the last one (``page``
+is capped at ``MAX_PAGE`` first, so the offset always fits the database).
+
+``link_pages`` turns the tokens into the previous/next page URLs, plus the
+URL of the next batch of cards alone for infinite scroll (``render_cards``
+in ``apps.core.views``).
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+
+from django.db.models import F, Q
+
+from apps.core.views import resolve_page, resolve_per_page
+
+
+@dataclass
+class KeysetPage:
+    """The slice of the page API the list templates use (no ``paginator``)."""
+
+    object_list: list
+    number: int
+    next_token: str | None = None
+    previous_token: str | None = None
+    previous_url: str | None = None
+    next_url: str | None = None
+    next_fragment_url: str | None = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_token is not None
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+def encode_token(obj, field: str) -> str:
+    value = getattr(obj, field)
+    raw = json.dumps([value.isoformat() if value is not None else None, obj.pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str | None, model, field: str):
+    """``(value, pk)`` from a token, or ``None`` if it is missing or malformed."""
+    if not token:
+        return None
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return model._meta.get_field(field).to_python(value), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def _query(params, **changes) -> str:
+    query = params.copy()
+    for key, value in changes.items():
+        if value is None:
+            query.pop(key, None)
+        else:
+            query[key] = value
+    return query.urlencode()
+
+
+def link_pages(page, request, page_path=None, fragment_path=None, **fragment_params):
+    """Set ``page``'s previous/next URLs (on ``page_path``, default: this path) and return it.
+
+    With ``fragment_path``, also ``next_fragment_url``: the next batch of
+    cards alone, with ``fragment_params`` (e.g. ``category``) in its query,
+    which the page URLs leave out.
+    """
+    page_path = page_path or request.path
+    params = request.GET.copy()
+    for key in fragment_params:
+        params.pop(key, None)
+    if page.has_previous():
+        changes = {"page": page.previous_page_number(), "before": page.previous_token, "after": None}
+        page.previous_url = f"{page_path}?{_query(params, **changes)}"
+    if page.has_next():
+        changes = {"page": page.next_page_number(), "after": page.next_token, "before": None}
+        page.next_url = f"{page_path}?{_query(params, **changes)}"
+        if fragment_path:
+            page.next_fragment_url = f"{fragment_path}?{_query(params, **changes, **fragment_params)}"
+    return page
+
+
+def _after(field, value, pk):
+    """Rows following ``(value, pk)`` in ``field DESC NULLS FIRST, id DESC`` order."""
+    if value is None:
+        return Q(**{f"{field}__isnull": False}) | Q(**{f"{field}__isnull": True, "pk__lt": pk})
+    # The redundant ``<=`` bound lets the database range-scan the index.
+    return Q(**{f"{field}__lte": value}) & (Q(**{f"{field}__lt": value}) | Q(**{field: value, "pk__lt": pk}))
+
+
+def _before(field, value, pk):
+    if value is None:
+        return Q(**{f"{field}__isnull": True, "pk__gt": pk})
+    return Q(**{f"{field}__isnull": True}) | Q(**{f"{field}__gt": value}) | Q(**{field: value, "pk__gt": pk})
+
+
+def paginate_keyset(request, queryset, field, per_page=None):
+    """Paginate ``queryset`` newest ``field`` first; returns a ``KeysetPage``."""
+    if per_page is None:
+        per_page = resolve_per_page(request)
+    number = resolve_page(request)
+    forward = queryset.order_by(F(field).desc(nulls_first=True), "-pk")
+    after = decode_token(request.GET.get("after"), queryset.model, field)
+    before = decode_token(request.GET.get("before"), queryset.model, field) if after is None else None
+
+    if before is not None:
+        backward = queryset.filter(_before(field, *before)).order_by(F(field).asc(nulls_last=True), "pk")
+        rows = list(backward[: per_page + 1])[::-1]
+        # Reaching the start means page 1, whatever the link said.
+        number = max(number, 2) if len(rows) > per_page else 1
+        rows = rows[-per_page:]
+        has_next = True
+    else:
+        if after is not None:
+            number = max(number, 2)
+            rows = list(forward.filter(_after(field, *after))[: per_page + 1])
+        else:
+            offset = (number - 1) * per_page
+            rows = list(forward[offset : offset + per_page + 1])
+            if not rows and number > 1:
+                number = max((queryset.count() - 1) // per_page + 1, 1)
+                offset = (number - 1) * per_page
+                rows = list(forward[offset : offset + per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+
+    page = KeysetPage(rows, number)
+    if rows and has_next:
+        page.next_token = encode_token(rows[-1], field)
+    if rows and number > 1:
+        page.previous_token = encode_token(rows[0], field)
+    return page
@@ -0,0 +1,213 @@
+"""Precomputed "Related posts" of articles and writeups.
+
+Every article and writeup keeps its ``RELATED_COUNT`` best matches among
+public articles and writeups in ``RelatedPost``, so a detail page reads its
+list with one indexed query. A candidate scores::
+
+    TAG_WEIGHT * Jaccard(tag slugs)
+    + CATEGORY_WEIGHT * (same category slug)
+    + RECENCY_WEIGHT * 0.5 ** (age in days / RECENCY_HALF_LIFE_DAYS)
+
+Tags and categories are compared by slug, since articles and writeups use
+separate models for both.
+
+``refresh`` runs once a post save or tag change commits (see
+``apps.core.signals``). It recomputes the list of the saved post, the lists
+that held it, the lists it now scores into and the lists still short of
+``RELATED_COUNT``, loading only those posts and their possible candidates:
+posts sharing a tag or category with them, plus the few most recent ones
+(a post sharing nothing can only score on recency). ``rebuild`` recomputes
+every list, as migration ``core.0016`` does once; run it periodically
+(``manage.py rebuild_related_posts``) so recency stays current and tag
+renames are picked up.
+
+``related_posts`` leaves out the types whose list page is switched off
+(``SiteSettings`` features), so "See also" never links to a 404.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from apps.blog.models import Article
+from apps.core.models import RelatedPost, SiteSettings
+from apps.infosec.models import Writeup
+
+RELATED_COUNT = 4
+TAG_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.5
+RECENCY_WEIGHT = 0.25
+RECENCY_HALF_LIFE_DAYS = 180
+# Post models with a list, and the ``RelatedPost`` field pointing at each.
+RELATED_TYPES = ((Article, "article"), (Writeup, "writeup"))
+# ``RelatedPost`` field -> (SiteSettings module, feature) serving its pages.
+FEATURES = {"article": ("blog", "articles"), "writeup": ("infosec", "writeups")}
+
+
+@dataclass
+class _Post:
+    public: bool
+    category: str | None
+    published_on: datetime | None
+    tags: set = field(default_factory=set)
+
+
+def _features(select=None):
+    """``{(content type id, pk): _Post}`` for every article and writeup, or for
+    those ``select(model, type_id)`` (a ``Q``) picks; one query per model."""
+    posts = {}
+    for model, _ in RELATED_TYPES:
+        type_id = ContentType.objects.get_for_model(model).pk
+        rows = model.objects.all()
+        if select is not None:
+            # Selected through a subquery, so a tag filter does not also narrow the tags read.
+            rows = rows.filter(pk__in=model.objects.filter(select(model, type_id)).values("pk"))
+        rows = rows.values_list("pk", "visibility", "category__slug", "published_on", "tags__slug")
+        for pk, visibility, category, published_on, tag in rows:
+            post = posts.get((type_id, pk))
+            if post is None:
+                # "undefined" is the placeholder every uncategorised post falls into.
+                post = _Post(visibility == "public", category if category != "undefined" else None, published_on)
+                posts[(type_id, pk)] = post
+            if tag:
+                post.tags.add(tag)
+    return posts
+
+
+def _neighbourhood(keys):
+    """The posts of ``keys`` and every public post that could make their lists."""
+    sources = _features(lambda _model, type_id: Q(pk__in=[pk for t, pk in keys if t == type_id]))
+    tags = set().union(*(post.tags for post in sources.values()))
+    categories = {post.category for post in sources.values()} - {None}
+
+    def candidates(model, type_id):
+        public = model.objects.filter(visibility="public")
+        recent = public.order_by(F("published_on").desc(nulls_last=True), "-pk").values("pk")[: RELATED_COUNT + 1]
+        shared = Q(tags__slug__in=list(tags)) | Q(category__slug__in=list(categories))
+        return Q(visibility="public") & shared | Q(pk__in=recent)
+
+    posts = _features(candidates)
+    posts.update(sources)
+    return posts
+
+
+def _score(source, candidate, now):
+    union = source.tags | candidate.tags
+    score = TAG_WEIGHT * len(source.tags & candidate.tags) / len(union) if union else 0.0
+    if source.category and source.category == candidate.category:
+        score += CATEGORY_WEIGHT
+    if candidate.published_on:
+        age = max((now - candidate.published_on).total_seconds(), 0) / 86400
+        score += RECENCY_WEIGHT * 0.5 ** (age / RECENCY_HALF_LIFE_DAYS)
+    return score
+
+
+def _best(key, posts, now):
+    """The ``RELATED_COUNT`` best ``(score, candidate key)`` for ``key``."""
+    source = posts.get(key)
+    if source is None:
+        return []
+    scored = ((_score(source, post, now), other) for other, post in posts.items() if post.public and other != key)
+    return heapq.nlargest(RELATED_COUNT, scored, key=lambda item: (item[0], item[1][1]))
+
+
+def _rows(key, best):
+    targets = {ContentType.objects.get_for_model(model).pk: name for model, name in RELATED_TYPES}
+    return [
+        RelatedPost(
+            source_type_id=key[0],
+            source_id=key[1],
+            rank=rank,
+            score=score,
+            **{f"{targets[type_id]}_id": pk},
+        )
+        for rank, (score, (type_id, pk)) in enumerate(best)
+    ]
+
+
+def _store(keys, posts, now):
+    sources = Q()
+    for type_id, pk in keys:
+        sources |= Q(source_type_id=type_id, source_id=pk)
+    rows = [row for key in keys for row in _rows(key, _best(key, posts, now))]
+    with transaction.atomic():
+        RelatedPost.objects.filter(sources).delete()
+        RelatedPost.objects.bulk_create(rows)
+
+
+def refresh(post_model, pk):
+    """Bring the lists touched by a change to one post (or its deletion) up to date."""
+    now = timezone.now()
+    type_id = ContentType.objects.get_for_model(post_model).pk
+    key = (type_id, pk)
+    target = dict(RELATED_TYPES)[post_model]
+
+    stale = {key}
+    stale.update(RelatedPost.objects.filter(**{f"{target}_id": pk}).values_list("source_type_id", "source_id"))
+    lists = RelatedPost.objects.values("source_type_id", "source_id").annotate(count=Count("id"), floor=Min("score"))
+    # Lists still short of a full set, including empty ones.
+    stale.update(lists.filter(count__lt=RELATED_COUNT).values_list("source_type_id", "source_id"))
+    for model, _ in RELATED_TYPES:
+        model_type_id = ContentType.objects.get_for_model(model).pk
+        listed = RelatedPost.objects.filter(source_type_id=model_type_id).values("source_id")
+        stale.update(
+            (model_type_id, other) for other in model.objects.exclude(pk__in=listed).values_list("pk", flat=True)
+        )
+
+    posts = _neighbourhood({key})
+    candidate = posts.get(key)
+    if candidate and candidate.public:
+        # A post sharing nothing with it only sees its recency.
+        reach = _score(_Post(public=False, category=None, published_on=None), candidate, now)
+        stale.update(lists.filter(floor__lt=reach).values_list("source_type_id", "source_id"))
+        floors = {}
+        for other_type in {other_type for other_type, _ in posts}:
+            near = lists.filter(source_type_id=other_type, source_id__in=[p for t, p in posts if t == other_type])
+            floors.update(((row["source_type_id"], row["source_id"]), row["floor"]) for row in near)
+        for other, post in posts.items():
+            if other != key and _score(post, candidate, now) > floors.get(other, 0.0):
+                stale.add(other)
+    _store(stale, _neighbourhood(stale), now)
+
+
+def rebuild():
+    """Recompute every list; returns the number of posts."""
+    posts = _features()
+    now = timezone.now()
+    rows = [row for key in posts for row in _rows(key, _best(key, posts, now))]
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        RelatedPost.objects.bulk_create(rows, batch_size=500)
+    return len(posts)
+
+
+def _active_targets():
+    """The ``RelatedPost`` target fields whose list and detail pages are switched on."""
+    site_settings = SiteSettings.objects.select_related(*{module for module, _ in FEATURES.values()}).first()
+    active = []
+    for target, (module_name, feature_name) in FEATURES.items():
+        module = getattr(site_settings, module_name, None)
+        if module and module.is_active and getattr(module, f"activate_{feature_name}_page", False):
+            active.append(target)
+    return active
+
+
+def related_posts(post):
+    """The precomputed related articles and writeups of ``post``, best first,
+    leaving out the types whose pages are switched off."""
+    active = Q()
+    for target in _active_targets():
+        active |= Q(**{f"{target}__isnull": False})
+    if not active:
+        return []
+    rows = (
+        RelatedPost.objects.filter(active, source_type=ContentType.objects.get_for_model(post), source_id=post.pk)
+        .select_related("article__category", "writeup__category")
+        .order_by("rank")
+    )
+    return [row.post for row in rows]
@@ -1,26 +1,56 @@
 """Cross-app search service for translated post types.
 
-PostgreSQL backend uses ``SearchVector + SearchQuery + SearchRank`` with the
-language-specific text-search config (``french``, ``english``, ``italian``)
-so stemming and stop-words match the user's content. SQLite (dev only)
-falls back to ``icontains`` chains so local development doesn't require
-Postgres. The dev fallback returns no rank but preserves the same shape so
-templates don't branch.
+PostgreSQL backend matches a ``SearchQuery`` against each translation's stored
+``search_vector`` (weighted title/description/content, built with the
+language-specific text-search config — ``french``, ``english``, ``italian`` —
+so stemming and stop-words match the user's content). The column is GIN
+indexed and refreshed by a post_save signal (``index_translation``), so a
+search is an index lookup instead of re-tokenizing every translation.
+
+SQLite keeps every translation of the three post types in one FTS5 table
+(``core_search_fts``, created by ``core.0014``, synced by the same post_save /
+post_delete signals) and ranks with ``bm25`` using column weights that mirror
+the Postgres A/B/C weights. Any other backend (or a SQLite build without the
+table) falls back to ``icontains`` chains with a coarse rank; every backend
+returns the same shape so templates don't branch.
+
+Whatever the backend, each post type contributes one ranked ``SELECT`` (only
+publicly visible posts, filtered in SQL) and ``search_posts`` runs them as a
+single ``UNION ALL``: one round-trip returns the requested page, in rank
+order across types, together with the per-type facet counts. Pages are
+addressed by offset or, cheaper for deep pages, by the keyset cursor of the
+previous page's last hit. Each page's ids and ranks are cached under the
+normalised query and a generation counter that any translation or post
+save bumps, so popular queries skip ranking until the content changes.
+
+When a search finds nothing, ``suggest`` offers "did you mean" terms from
+post titles, tags and CVE ids in one extra query: ``pg_trgm`` similarity
+(GIN trigram indexed by ``core.0015``) on PostgreSQL, ``difflib`` elsewhere.
+A term matched by one of its words suggests that word, not the whole title,
+and the same word found in several places is suggested once.
 
 Search is scoped to translations in the active language only — Google's
 hreflang strategy means each language is a distinct content surface, so
 mixing them in results would dilute relevance.
 """
 
-from collections.abc import Iterable
-from dataclasses import dataclass
+import difflib
+import hashlib
+import re
+import time
+from dataclasses import dataclass, field
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import connection
-from django.db.models import Case, Q, Value, When
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Cast
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
 
-from apps.blog.models import Article, ArticleTranslation
+from apps.blog.models import Article, ArticleTag, ArticleTranslation
 from apps.education.models import Lesson, LessonTranslation
-from apps.infosec.models import Writeup, WriteupTranslation
+from apps.infosec.models import CVE, Writeup, WriteupTag, WriteupTranslation
 
 # Map our short language codes to PostgreSQL ts_config names. Postgres ships
 # with stemming for these ~16 languages out of the box; anything else falls
@@ -64,53 +94,298 @@ POST_TYPES = (
 )
 
 
+# FTS5 table shared by all post types. Row ids encode the translation:
+# ``id * FTS_KINDS + kind`` where ``kind`` is the index in ``POST_TYPES``.
+FTS_TABLE = "core_search_fts"
+FTS_KINDS = 4
+# bm25 weights for title, description, content, language: PostgreSQL's
+# default ts_rank weights for A, B and C (language is never matched).
+FTS_WEIGHTS = (1.0, 0.4, 0.2, 0.0)
+RESULTS_PER_PAGE = 20
+SEARCH_CACHE_TIMEOUT = 10 * 60
+GENERATION_KEY = "search:generation"
+# Snippet length in words (tokens on FTS5). The database wraps matches in
+# these control characters; ``highlight`` swaps them for <mark> after
+# escaping, so post content can never inject markup into the results page.
+SNIPPET_WORDS = 30
+MARK_START, MARK_END = "\x02", "\x03"
+# Extra relations each post type's result card needs.
+RELATED = {
+    "articles": ("translatable_content__category",),
+    "writeups": ("translatable_content__category",),
+    "lessons": ("translatable_content__module__course",),
+}
+SUGGESTIONS = 5
+# difflib ratio a term (or one of its words) needs to be suggested off PostgreSQL.
+SUGGEST_CUTOFF = 0.6
+
+
 @dataclass
 class SearchHit:
     post: object  # Article | Writeup | Lesson
     translation: object  # the matched *Translation row
-    rank: float  # 0.0 on SQLite fallback
+    rank: float  # backend-specific; only comparable within one search
+    kind: str = ""  # POST_TYPES key: "articles", "writeups" or "lessons"
+    snippet: str = ""  # safe HTML excerpt of the content, matches in <mark>
 
 
-def search_posts(query: str, language: str) -> dict[str, list[SearchHit]]:
-    """Return matching posts grouped by type, ordered by rank desc."""
-    query = (query or "").strip()
+@dataclass
+class SearchResults:
+    hits: list[SearchHit] = field(default_factory=list)  # one page, best first
+    facets: dict[str, int] = field(default_factory=dict)  # matches per type, ignoring the type filter
+    kind: str | None = None  # type filter the page was drawn from
+    next_cursor: str | None = None  # keyset cursor of the next page, if any
+
+    @property
+    def total(self) -> int:
+        """Matches behind the current filter (all pages)."""
+        return self.facets.get(self.kind, 0) if self.kind else sum(self.facets.values())
+
+    @property
+    def grand_total(self) -> int:
+        """Matches across every type."""
+        return sum(self.facets.values())
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def search_posts(
+    query: str,
+    language: str,
+    kind: str | None = None,
+    limit: int = RESULTS_PER_PAGE,
+    offset: int = 0,
+    after: str | None = None,
+) -> SearchResults:
+    """One page of matching posts across types, ordered by rank desc.
+
+    ``kind`` restricts the page to one ``POST_TYPES`` key (facets still
+    count every type). ``after`` is a ``next_cursor`` from a previous page
+    and takes precedence over ``offset``; an unreadable cursor restarts at
+    the first page. Pages are cached, see ``_cached_page``.
+    """
+    keys = [key for key, _, _ in POST_TYPES]
+    results = SearchResults(facets=dict.fromkeys(keys, 0), kind=kind if kind in keys else None)
+    query = normalize_query(query)
     if not query:
-        return {key: [] for key, _, _ in POST_TYPES}
+        return results
+
+    rows, facets, results.next_cursor = _cached_page(query, language, results.kind, limit, offset, after)
+    results.facets.update(facets)
+    results.hits = _load_hits(rows, query, language)
+    return results
+
+
+def normalize_query(query: str | None) -> str:
+    """Case- and whitespace-insensitive form of ``query`` (every backend ignores both)."""
+    return " ".join((query or "").casefold().split())
+
+
+def generation() -> int:
+    """Current search-index generation; part of every result cache key."""
+    # Seeded from the clock rather than 0 so a counter evicted from the cache
+    # never comes back at a value older entries were stored under.
+    value = cache.get(GENERATION_KEY)
+    if value is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        value = cache.get(GENERATION_KEY, 0)
+    return value
+
+
+def bump_generation() -> None:
+    """Invalidate every cached result page (called on translation/post changes)."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def _cached_page(query, language, kind, limit, offset, after):
+    """``(rows, facets, next_cursor)`` of one page, cached per index generation.
+
+    Only ids and ranks are cached; ``search_posts`` hydrates them, so a hit
+    costs a cache read plus one bulk query per post type on the page.
+    """
+    timeout = getattr(settings, "SEARCH_CACHE_TIMEOUT", SEARCH_CACHE_TIMEOUT)
+    if not timeout:
+        return _search_page(query, language, kind, limit, offset, after)
+    raw = "\x1f".join(map(str, (generation(), language, kind, limit, offset, after, query)))
+    key = f"search:page:{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"
+    page = cache.get(key)
+    if page is None:
+        page = _search_page(query, language, kind, limit, offset, after)
+        cache.set(key, page, timeout)
+    return page
 
+
+def _search_page(query, language, kind, limit, offset, after):
     if connection.vendor == "postgresql":
-        return _postgres_search(query, language)
-    return _fallback_search(query, language)
+        parts = _postgres_parts(query, language)
+    elif connection.vendor == "sqlite" and _has_fts_table():
+        parts = _fts_parts(query, language)
+    else:
+        parts = _fallback_parts(query, language)
+    if not parts:
+        return [], {}, None
 
+    keys = [key for key, _, _ in POST_TYPES]
+    kind_index = keys.index(kind) if kind else None
+    rows, facets = _run(parts, kind_index, limit + 1, offset, _decode_cursor(after))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1])
+    return rows, {keys[k]: int(n) for k, n in facets}, next_cursor
 
-def _postgres_search(query: str, language: str) -> dict[str, list[SearchHit]]:
-    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 
-    config = PG_TEXT_SEARCH_CONFIG.get(language, "simple")
-    search_query = SearchQuery(query, config=config, search_type="websearch")
-    vector = (
+def weighted_vector(config: str):
+    """The stored ``search_vector`` expression: title (A) > description (B) > content (C)."""
+    from django.contrib.postgres.search import SearchVector
+
+    return (
         SearchVector("title", weight="A", config=config)
         + SearchVector("description", weight="B", config=config)
         + SearchVector("content", weight="C", config=config)
     )
 
-    results: dict[str, list[SearchHit]] = {}
-    for key, post_model, translation_model in POST_TYPES:
-        translations = (
-            translation_model.objects.filter(language=language)
-            .annotate(rank=SearchRank(vector, search_query))
-            .filter(rank__gt=0)
-            .select_related("translatable_content")
-            .order_by("-rank")[:30]
+
+def index_translation(translation) -> None:
+    """Refresh one translation's index: its ``search_vector`` on PostgreSQL,
+    its FTS5 row on SQLite.
+
+    Called from the post_save signal (``apps.core.signals``);
+    ``QuerySet.update()`` / ``bulk_create`` bypass it, use ``reindex`` after
+    those.
+    """
+    if connection.vendor == "postgresql":
+        config = PG_TEXT_SEARCH_CONFIG.get(translation.language, "simple")
+        type(translation).objects.filter(pk=translation.pk).update(search_vector=weighted_vector(config))
+    else:
+        index_fts(translation)
+
+
+def reindex(translation_model) -> int:
+    """Rebuild the search index of every row of ``translation_model``.
+
+    PostgreSQL: ``search_vector``, one ``UPDATE`` per language. SQLite: the
+    model's rows of the FTS5 table. For bulk loads that bypass ``save()``.
+    """
+    if connection.vendor == "sqlite" and _has_fts_table():
+        return _reindex_fts(translation_model)
+    if connection.vendor != "postgresql":
+        return 0
+    updated = 0
+    for language in translation_model.objects.values_list("language", flat=True).distinct().order_by():
+        config = PG_TEXT_SEARCH_CONFIG.get(language, "simple")
+        updated += translation_model.objects.filter(language=language).update(search_vector=weighted_vector(config))
+    return updated
+
+
+def _reindex_fts(translation_model) -> int:
+    table = translation_model._meta.db_table
+    kind = next(i for i, (_, _, model) in enumerate(POST_TYPES) if model._meta.db_table == table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid % {FTS_KINDS} = {kind}")  # noqa: S608 - constants
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, content, language) "  # noqa: S608
+            f"SELECT id * {FTS_KINDS} + {kind}, title, coalesce(description, ''), content, language FROM {table}"
         )
-        results[key] = [
-            SearchHit(post=t.translatable_content, translation=t, rank=float(t.rank))
-            for t in _filter_published(translations, post_model)
-        ]
-    return results
+        return cursor.rowcount
+
+
+def _fts_rowid(translation) -> int | None:
+    for kind, (_, _, translation_model) in enumerate(POST_TYPES):
+        if isinstance(translation, translation_model):
+            return translation.pk * FTS_KINDS + kind
+    return None
+
+
+_fts_ready = set()  # database aliases known to have the FTS table
+
+
+def _has_fts_table() -> bool:
+    """Whether the FTS5 table exists; only a positive answer is remembered."""
+    if connection.alias not in _fts_ready and FTS_TABLE in connection.introspection.table_names():
+        _fts_ready.add(connection.alias)
+    return connection.alias in _fts_ready
+
+
+def index_fts(translation) -> None:
+    """Upsert one translation into the SQLite FTS5 table (no-op elsewhere)."""
+    rowid = _fts_rowid(translation)
+    if connection.vendor != "sqlite" or rowid is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [rowid])  # noqa: S608 - constant table name
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, content, language) "  # noqa: S608
+            "VALUES (%s, %s, %s, %s, %s)",
+            [rowid, translation.title, translation.description or "", translation.content, translation.language],
+        )
+
+
+def unindex_fts(translation) -> None:
+    """Drop one translation from the SQLite FTS5 table (no-op elsewhere)."""
+    rowid = _fts_rowid(translation)
+    if connection.vendor != "sqlite" or rowid is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [rowid])  # noqa: S608 - constant table name
 
 
-def _fallback_search(query: str, language: str) -> dict[str, list[SearchHit]]:
-    """SQLite-friendly substring search. Used in dev only — Postgres in prod."""
+def _fts_query(query: str) -> str:
+    """Quote every word so user input can't inject FTS5 syntax; terms are ANDed."""
+    return " ".join(f'"{token}"' for token in re.findall(r"\w+", query))
+
+
+def _ranked(qs, kind: int, rank):
+    """One post type's ``(id, kind, rank)`` select, public posts only."""
+    post_model = POST_TYPES[kind][1]
+    if hasattr(post_model, "visibility"):
+        qs = qs.filter(translatable_content__visibility="public")
+    qs = qs.annotate(kind=Value(kind, output_field=IntegerField()), rank=Cast(rank, FloatField()))
+    return qs.order_by().values_list("id", "kind", "rank").query.sql_with_params()
+
+
+def _postgres_parts(query: str, language: str) -> list[tuple[str, tuple]]:
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    config = PG_TEXT_SEARCH_CONFIG.get(language, "simple")
+    search_query = SearchQuery(query, config=config, search_type="websearch")
+    return [
+        _ranked(
+            translation_model.objects.filter(language=language, search_vector=search_query),
+            kind,
+            SearchRank(F("search_vector"), search_query),
+        )
+        for kind, (_, _, translation_model) in enumerate(POST_TYPES)
+    ]
+
+
+def _fts_parts(query: str, language: str) -> list[tuple[str, tuple]]:
+    match = _fts_query(query)
+    if not match:
+        return []
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    parts = []
+    for kind, (_, post_model, translation_model) in enumerate(POST_TYPES):
+        # bm25 is lower-is-better; negate it so rank sorts like the other backends.
+        sql = (
+            f"SELECT t.id AS id, {kind} AS kind, -bm25({FTS_TABLE}, {weights}) AS rank "  # noqa: S608 - constants
+            f"FROM {FTS_TABLE} JOIN {translation_model._meta.db_table} t ON t.id = {FTS_TABLE}.rowid / {FTS_KINDS}"
+        )
+        where = f"{FTS_TABLE} MATCH %s AND {FTS_TABLE}.language = %s AND {FTS_TABLE}.rowid %% {FTS_KINDS} = {kind}"
+        if hasattr(post_model, "visibility"):
+            sql += f" JOIN {post_model._meta.db_table} p ON p.id = t.translatable_content_id"
+            where += " AND p.visibility = 'public'"
+        parts.append((f"{sql} WHERE {where}", (match, language)))
+    return parts
+
+
+def _fallback_parts(query: str, language: str) -> list[tuple[str, tuple]]:
+    """Substring search for backends without a full-text index."""
     needle = Q(title__icontains=query) | Q(description__icontains=query) | Q(content__icontains=query)
     # Bias title hits to the top so ordering is at least roughly useful.
     rank_expr = Case(
@@ -118,30 +393,192 @@ def _fallback_search(query: str, language: str) -> dict[str, list[SearchHit]]:
         When(description__icontains=query, then=Value(2.0)),
         default=Value(1.0),
     )
+    return [
+        _ranked(translation_model.objects.filter(needle, language=language), kind, rank_expr)
+        for kind, (_, _, translation_model) in enumerate(POST_TYPES)
+    ]
 
-    results: dict[str, list[SearchHit]] = {}
-    for key, post_model, translation_model in POST_TYPES:
-        translations = (
-            translation_model.objects.filter(language=language)
-            .filter(needle)
-            .annotate(rank=rank_expr)
-            .select_related("translatable_content")
-            .order_by("-rank", "-id")[:30]
-        )
-        results[key] = [
-            SearchHit(post=t.translatable_content, translation=t, rank=float(t.rank))
-            for t in _filter_published(translations, post_model)
-        ]
-    return results
+
+def _run(parts, kind, limit, offset, after):
+    """Run the per-type selects as one ``UNION ALL``.
+
+    Returns the page's ``(id, kind, rank)`` rows in order and the
+    ``(kind, count)`` facet rows, fetched in the same statement.
+    """
+    filters, params = [], []
+    for sql_params in parts:
+        params.extend(sql_params[1])
+    if kind is not None:
+        filters.append("kind = %s")
+        params.append(kind)
+    if after is not None:
+        rank, after_kind, after_id = after
+        filters.append("(rank < %s OR (rank = %s AND (kind > %s OR (kind = %s AND id > %s))))")
+        params += [rank, rank, after_kind, after_kind, after_id]
+        offset = 0
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+    params += [limit, offset]
+    # Only placeholders and the backends' own selects are interpolated.
+    sql = (
+        f"WITH hits AS ({' UNION ALL '.join(sql for sql, _ in parts)}), "  # noqa: S608
+        f"page AS (SELECT id, kind, rank FROM hits {where} ORDER BY rank DESC, kind, id LIMIT %s OFFSET %s) "
+        "SELECT 1, id, kind, rank FROM page "
+        "UNION ALL SELECT 0, NULL, kind, COUNT(*) FROM hits GROUP BY kind"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    page = sorted(((pk, k, float(rank)) for hit, pk, k, rank in rows if hit), key=lambda r: (-r[2], r[1], r[0]))
+    return page, [(k, n) for hit, _, k, n in rows if not hit]
+
+
+def _encode_cursor(row) -> str:
+    pk, kind, rank = row
+    return f"{rank!r}:{kind}:{pk}"
+
+
+def _decode_cursor(cursor: str | None):
+    try:
+        rank, kind, pk = (cursor or "").split(":")
+        return float(rank), int(kind), int(pk)
+    except ValueError:
+        return None
+
+
+def _load_hits(rows, query: str, language: str) -> list[SearchHit]:
+    """Materialise ``(id, kind, rank)`` rows, a single query per post type present.
+
+    Translation bodies are deferred: the snippet is cut by the database
+    (``ts_headline`` in the same query on PostgreSQL, FTS5 ``snippet()`` in
+    one extra query on SQLite), for this page's hits only.
+    """
+    fts_snippets = {}
+    headline = None
+    if connection.vendor == "postgresql":
+        headline = _pg_headline(query, language)
+    elif connection.vendor == "sqlite" and _has_fts_table():
+        fts_snippets = _fts_snippets(rows, query)
+
+    loaded = {}
+    for kind, (key, _, translation_model) in enumerate(POST_TYPES):
+        ids = [pk for pk, k, _ in rows if k == kind]
+        if ids:
+            qs = translation_model.objects.select_related("translatable_content", *RELATED.get(key, ()))
+            qs = qs.defer("content", "search_vector")
+            if headline is not None:
+                qs = qs.annotate(snippet=headline)
+            loaded[kind] = qs.in_bulk(ids)
+    hits = []
+    for pk, kind, rank in rows:
+        translation = loaded[kind].get(pk)
+        if translation is not None:  # deleted since the search ran
+            snippet = getattr(translation, "snippet", None) or fts_snippets.get(pk * FTS_KINDS + kind)
+            hits.append(
+                SearchHit(translation.translatable_content, translation, rank, POST_TYPES[kind][0], highlight(snippet))
+            )
+    return hits
+
+
+def highlight(snippet: str | None) -> str:
+    """HTML-escape a database snippet, then turn its match markers into ``<mark>``."""
+    if not snippet:
+        return ""
+    return mark_safe(escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>"))  # noqa: S308
+
+
+def _pg_headline(query: str, language: str):
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery
+
+    config = PG_TEXT_SEARCH_CONFIG.get(language, "simple")
+    return SearchHeadline(
+        "content",
+        SearchQuery(query, config=config, search_type="websearch"),
+        config=config,
+        start_sel=MARK_START,
+        stop_sel=MARK_END,
+        max_words=SNIPPET_WORDS,
+        min_words=SNIPPET_WORDS // 2,
+        max_fragments=2,
+        fragment_delimiter=" … ",
+    )
+
+
+def _fts_snippets(rows, query: str) -> dict[int, str]:
+    """``{fts rowid: snippet}`` of the content column for the page's rows."""
+    match = _fts_query(query)
+    rowids = [pk * FTS_KINDS + kind for pk, kind, _ in rows]
+    if not match or not rowids:
+        return {}
+    sql = (
+        f"SELECT rowid, snippet({FTS_TABLE}, 2, %s, %s, '…', {SNIPPET_WORDS}) FROM {FTS_TABLE} "  # noqa: S608
+        f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({', '.join(['%s'] * len(rowids))})"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [MARK_START, MARK_END, match, *rowids])
+        return dict(cursor.fetchall())
 
 
-def _filter_published(translations: Iterable, post_model) -> list:
-    """Drop hits whose parent post isn't publicly visible.
+def suggest(query: str, language: str, limit: int = SUGGESTIONS) -> list[str]:
+    """Public titles, tags and CVE ids close to ``query``, best first."""
+    query = (query or "").strip()
+    if not query:
+        return []
+    if connection.vendor == "postgresql":
+        # Over-fetch: several titles often reduce to the same word.
+        terms = _closest_forms(query, _trigram_suggestions(query, language, 4 * (limit + 1)))
+    else:
+        terms = _closest_forms(query, _difflib_candidates(language), cutoff=SUGGEST_CUTOFF)
+    return [t for t in terms if t.lower() != query.lower()][:limit]
+
+
+def _suggestion_sources(language: str) -> list[tuple]:
+    """``(queryset, field)`` pairs the suggestions are drawn from."""
+    sources = [
+        (translation_model.objects.filter(language=language, translatable_content__visibility="public"), "title")
+        for _, _, translation_model in POST_TYPES
+    ]
+    sources += [(ArticleTag.objects.all(), "title"), (WriteupTag.objects.all(), "title")]
+    sources.append((CVE.objects.filter(visibility="public"), "cve_id"))
+    return sources
+
+
+def _trigram_suggestions(query: str, language: str, limit: int) -> list[str]:
+    from django.contrib.postgres.search import TrigramSimilarity, TrigramWordSimilarity
+    from django.db.models.functions import Greatest
 
-    Article, Writeup and Lesson all carry a `visibility` field; we never
-    surface ``private`` rows in search results, even to authenticated users
-    — search is a public-content discovery surface.
+    # ``%`` catches whole-term typos ("kerbros" ~ "Kerberos"), ``%>`` a typo
+    # of one word inside a longer title; both are served by the trigram index.
+    parts = [
+        qs.filter(Q(**{f"{field}__trigram_similar": query}) | Q(**{f"{field}__trigram_word_similar": query}))
+        .annotate(score=Greatest(TrigramSimilarity(field, query), TrigramWordSimilarity(query, field)))
+        .values_list(field, "score")
+        .order_by()
+        for qs, field in _suggestion_sources(language)
+    ]
+    # UNION (not ALL) folds a term found in several sources into one row.
+    union = parts[0].union(*parts[1:]).order_by("-score", "title")[:limit]
+    return [term for term, _ in union]
+
+
+def _difflib_candidates(language: str) -> list[str]:
+    parts = [qs.values_list(field).order_by() for qs, field in _suggestion_sources(language)]
+    return [term for (term,) in parts[0].union(*parts[1:])]
+
+
+def _closest_forms(query: str, terms, cutoff: float = 0.0) -> list[str]:
+    """Each term, or its word closest to ``query``, deduplicated, best first.
+
+    Whole terms (a tag, a short title, a CVE id) win ties with a word cut
+    out of a longer title, so "Kerberos" the tag beats "kerberos" the word.
     """
-    if not hasattr(post_model, "visibility"):
-        return list(translations)
-    return [t for t in translations if getattr(t.translatable_content, "visibility", "public") == "public"]
+    needle = query.lower()
+    best = {}
+    for term in terms:
+        forms = [term, *re.findall(r"[\w-]+", term)]
+        score, whole, form = max(
+            (difflib.SequenceMatcher(None, needle, f.lower()).ratio(), i == 0, f) for i, f in enumerate(forms)
+        )
+        key = form.casefold()
+        if score >= cutoff and (key not in best or (score, whole) > best[key][:2]):
+            best[key] = (score, whole, form)
+    return [form for _, _, form in sorted(best.values(), key=lambda item: (-item[0], not item[1], item[2]))]
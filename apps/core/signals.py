@@ -1,9 +1,12 @@
+from functools import partial
+
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission, User
 from django.contrib.auth.signals import user_logged_in
 from django.core.cache import cache
-from django.db.models.signals import post_delete, post_migrate, post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
 from django.db.utils import OperationalError, ProgrammingError
 from django.dispatch import receiver
 from django.utils import translation
@@ -145,3 +148,163 @@ def register_translation_cache_invalidators():
 
 
 register_translation_cache_invalidators()
+
+
+def _bust_tag_caches(sender, **kwargs):
+    from apps.core.tags import TAG_CACHE_KEYS
+
+    cache.delete_many(TAG_CACHE_KEYS)
+
+
+def _remember_tags(sender, instance, **kwargs):
+    """Note a post's tags before it is deleted: its tag links go first."""
+    instance._recount_tag_pks = set(instance.tags.values_list("pk", flat=True))
+
+
+def _recount_tags(sender, instance, raw=False, **kwargs):
+    """A post save or delete may change which of its tags count it as public."""
+    if raw:
+        return
+    from apps.core.tags import refresh_counts
+
+    pks = instance.__dict__.pop("_recount_tag_pks", None)
+    if pks is None:
+        pks = set(instance.tags.values_list("pk", flat=True))
+    refresh_counts(type(instance)._meta.get_field("tags").related_model, pks)
+    _bust_tag_caches(sender)
+
+
+def _recount_tags_m2m(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """Recount the tags a post gained or lost (``pk_set``, or all of them on clear)."""
+    if action == "pre_clear" and not reverse:
+        _remember_tags(sender, instance)
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    from apps.core.tags import refresh_counts
+
+    if reverse:
+        refresh_counts(type(instance), {instance.pk})
+    elif action == "post_clear":
+        refresh_counts(model, instance.__dict__.pop("_recount_tag_pks", set()))
+    else:
+        refresh_counts(model, pk_set)
+    _bust_tag_caches(sender)
+
+
+def register_tag_index_invalidators():
+    """Keep tag ``post_count`` and the cached tag index and cloud in step with tags and posts."""
+    from apps.blog.models import Article, Project
+    from apps.infosec.models import Writeup
+
+    for post_model in (Article, Writeup, Project):
+        tag_model = post_model._meta.get_field("tags").related_model
+        post_save.connect(_bust_tag_caches, sender=tag_model, weak=False)
+        post_delete.connect(_bust_tag_caches, sender=tag_model, weak=False)
+        post_save.connect(_recount_tags, sender=post_model, weak=False)
+        pre_delete.connect(_remember_tags, sender=post_model, weak=False)
+        post_delete.connect(_recount_tags, sender=post_model, weak=False)
+        m2m_changed.connect(_recount_tags_m2m, sender=post_model.tags.through, weak=False)
+
+
+register_tag_index_invalidators()
+
+
+def _index_search_translation(sender, instance, **kwargs):
+    from apps.core.search import bump_generation, index_translation
+
+    index_translation(instance)
+    bump_generation()
+
+
+def _unindex_search_translation(sender, instance, **kwargs):
+    from apps.core.search import bump_generation, unindex_fts
+
+    unindex_fts(instance)
+    bump_generation()
+
+
+def _bump_search_generation(sender, **kwargs):
+    from apps.core.search import bump_generation
+
+    bump_generation()
+
+
+def register_search_index_sync():
+    """Keep the search index (PostgreSQL ``search_vector`` or SQLite FTS5
+    table) and the result cache in step with posts.
+
+    Post saves matter too: visibility decides what search may return.
+    """
+    from apps.core.search import POST_TYPES
+
+    for _, post_model, translation_model in POST_TYPES:
+        post_save.connect(_index_search_translation, sender=translation_model, weak=False)
+        post_delete.connect(_unindex_search_translation, sender=translation_model, weak=False)
+        post_save.connect(_bump_search_generation, sender=post_model, weak=False)
+        post_delete.connect(_bump_search_generation, sender=post_model, weak=False)
+
+
+register_search_index_sync()
+
+
+def _refresh_related_posts(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from apps.core.related import refresh
+
+    transaction.on_commit(partial(refresh, type(instance), instance.pk), robust=True)
+
+
+def _refresh_related_posts_tags(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    from apps.core.related import rebuild, refresh
+
+    if not reverse:
+        transaction.on_commit(partial(refresh, type(instance), instance.pk), robust=True)
+    elif pk_set is None:  # tag.posts.clear() does not say which posts lost the tag
+        transaction.on_commit(rebuild, robust=True)
+    else:
+        for pk in pk_set:
+            transaction.on_commit(partial(refresh, model, pk), robust=True)
+
+
+def register_related_posts_sync():
+    """Recompute "Related posts" after a post or its tags change, once committed."""
+    from apps.core.related import RELATED_TYPES
+
+    for post_model, _ in RELATED_TYPES:
+        post_save.connect(_refresh_related_posts, sender=post_model, weak=False)
+        post_delete.connect(_refresh_related_posts, sender=post_model, weak=False)
+        m2m_changed.connect(_refresh_related_posts_tags, sender=post_model.tags.through, weak=False)
+
+
+register_related_posts_sync()
+
+
+def _bump_list_version(post_model, sender, **kwargs):
+    from apps.core.listings import bump_version
+
+    bump_version(post_model)
+
+
+def register_list_cache_invalidators():
+    """Invalidate the cached list archives and category summaries (``apps.core.listings``).
+
+    Category changes count too: deleting one moves its posts, renaming or
+    translating it changes the category picker.
+    """
+    from apps.blog.models import Article
+    from apps.infosec.models import Writeup
+
+    for post_model in (Article, Writeup):
+        category_model = post_model._meta.get_field("category").related_model
+        category_translation_model = category_model._meta.get_field("translations").related_model
+        receiver = partial(_bump_list_version, post_model)
+        for model in (post_model, category_model, category_translation_model):
+            post_save.connect(receiver, sender=model, weak=False)
+            post_delete.connect(receiver, sender=model, weak=False)
+
+
+register_list_cache_invalidators()
@@ -0,0 +1,150 @@
+"""Cross-model tag pages.
+
+Article and writeup tags are separate models; a tag page gathers every tag
+whose ``slug`` matches, whatever model it belongs to. ``tag_index`` maps
+each slug to the titles behind it (cached, rebuilt after any tag change via
+``apps.core.signals``), so an unknown slug is a 404 without touching the
+posts. ``tagged_posts`` returns the public tagged posts of both types,
+newest first, with their total, from one ``UNION ALL`` query.
+
+Every tag also carries ``post_count``, its public posts, recounted by
+``refresh_counts`` in one ``UPDATE`` whenever posts or their tags change.
+``tag_cloud`` merges those counts by slug for the tag index page and is
+cached and invalidated with the slug index.
+"""
+
+import math
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.blog.models import Article, ArticleTag
+from apps.infosec.models import Writeup, WriteupTag
+
+TAG_INDEX_CACHE_KEY = "site:tag_index"
+TAG_CLOUD_CACHE_KEY = "site:tag_cloud"
+TAG_CACHE_KEYS = (TAG_INDEX_CACHE_KEY, TAG_CLOUD_CACHE_KEY)
+TAG_INDEX_CACHE_TTL = 60 * 60  # 1h
+# Font size steps of the tag cloud (``tag-cloud__tag--1`` .. ``--5``).
+CLOUD_SIZES = 5
+# Post types a tag page lists, in display order; the index is the ``kind`` column.
+TAGGED_TYPES = (("articles", Article), ("writeups", Writeup))
+
+
+def tag_index() -> dict[str, list[str]]:
+    """``{slug: [titles]}`` over article and writeup tags."""
+    index = cache.get(TAG_INDEX_CACHE_KEY)
+    if index is not None:
+        return index
+    index = {}
+    titles = (
+        ArticleTag.objects.exclude(slug="")
+        .values_list("slug", "title")
+        .union(WriteupTag.objects.exclude(slug="").values_list("slug", "title"))
+    )
+    for slug, title in titles:
+        index.setdefault(slug, []).append(title)
+    cache.set(TAG_INDEX_CACHE_KEY, index, TAG_INDEX_CACHE_TTL)
+    return index
+
+
+def display_title(titles) -> str:
+    """The canonical spelling of a tag: longest, then alphabetical."""
+    return min(titles, key=lambda t: (-len(t), t))
+
+
+def refresh_counts(tag_model, pks=None):
+    """Recount ``post_count`` on the tags of ``tag_model`` in ``pks`` (default:
+    all of them) with one ``UPDATE``.
+
+    Works on historical models too, for the backfilling migrations.
+    """
+    if pks is not None and not pks:
+        return 0
+    post_model = tag_model._meta.get_field("posts").related_model
+    posts = post_model.objects.filter(tags=OuterRef("pk"))
+    if any(f.name == "visibility" for f in post_model._meta.fields):
+        posts = posts.filter(visibility="public")
+    count = posts.order_by().values("tags").annotate(n=Count("pk")).values("n")
+    tags = tag_model.objects.all() if pks is None else tag_model.objects.filter(pk__in=pks)
+    return tags.update(post_count=Coalesce(Subquery(count), 0))
+
+
+def tag_cloud() -> list[dict]:
+    """Tags with public posts and a page (non-empty slug), merged by slug and
+    sorted by title.
+
+    Each entry is ``{"slug", "title", "count", "size"}``, ``size`` going from
+    1 to ``CLOUD_SIZES`` on a log scale of the count.
+    """
+    cloud = cache.get(TAG_CLOUD_CACHE_KEY)
+    if cloud is not None:
+        return cloud
+    counts, titles = {}, {}
+    rows = ArticleTag.objects.filter(post_count__gt=0).exclude(slug="").values_list("slug", "title", "post_count")
+    rows = rows.union(
+        WriteupTag.objects.filter(post_count__gt=0).exclude(slug="").values_list("slug", "title", "post_count"),
+        all=True,
+    )
+    for slug, title, count in rows:
+        counts[slug] = counts.get(slug, 0) + count
+        titles.setdefault(slug, []).append(title)
+    most = max(counts.values(), default=1)
+    cloud = sorted(
+        (
+            {
+                "slug": slug,
+                "title": display_title(titles[slug]),
+                "count": count,
+                "size": 1 + round((CLOUD_SIZES - 1) * math.log(count) / math.log(most)) if most > 1 else 1,
+            }
+            for slug, count in counts.items()
+        ),
+        key=lambda tag: tag["title"].casefold(),
+    )
+    cache.set(TAG_CLOUD_CACHE_KEY, cloud, TAG_INDEX_CACHE_TTL)
+    return cloud
+
+
+def tagged_posts(slug: str, limit: int | None = None, offset: int = 0) -> tuple[dict[str, list], int]:
+    """Public posts tagged ``slug``, per type in date order, and their total.
+
+    One query selects the page of ``(id, kind)`` rows across types together
+    with the window total; the posts are then loaded per type with their
+    card relations.
+    """
+    parts = [
+        model.objects.filter(visibility="public", tags__slug=slug)
+        .annotate(kind=Value(kind, output_field=IntegerField()))
+        .values_list("id", "kind", "published_on")
+        .distinct()
+        .order_by()
+        .query.sql_with_params()
+        for kind, (_, model) in enumerate(TAGGED_TYPES)
+    ]
+    params = [p for _, part_params in parts for p in part_params]
+    sql = (
+        "SELECT id, kind, COUNT(*) OVER () FROM ("  # noqa: S608 - the models' own selects
+        + " UNION ALL ".join(part_sql for part_sql, _ in parts)
+        + ") tagged ORDER BY published_on DESC NULLS FIRST, kind, id"
+    )
+    if limit is not None:
+        sql += " LIMIT %s OFFSET %s"
+        params += [limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    total = rows[0][2] if rows else 0
+    posts = {}
+    for kind, (key, model) in enumerate(TAGGED_TYPES):
+        ids = [pk for pk, k, _ in rows if k == kind]
+        loaded = (
+            model.objects.select_related("category").prefetch_related("translations", "tags").in_bulk(ids)
+            if ids
+            else {}
+        )
+        posts[key] = [loaded[pk] for pk in ids if pk in loaded]
+    return posts, total
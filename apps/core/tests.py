@@ -24,3 +24,432 @@ class PublicEndpointTests(TestCase):
         # Default language prefix is required (prefix_default_language=True).
         response = self.client.get(reverse("core:index"))
         assert response.status_code == HTTPStatus.OK
+
+
+class SearchTests(TestCase):
+    def test_search_matches_translation_in_active_language(self):
+        from apps.blog.models import Article, ArticleTranslation
+        from apps.core.search import search_posts
+
+        article = Article.objects.create(title="Kerberos", slug="kerberos")
+        ArticleTranslation.objects.create(
+            translatable_content=article,
+            language="en",
+            title="Kerberoasting explained",
+            content="Requesting service tickets for offline cracking.",
+        )
+        hits = search_posts("kerberoasting", "en").hits
+        assert [hit.post for hit in hits] == [article]
+        assert search_posts("kerberoasting", "fr").hits == []
+
+    def test_title_match_outranks_content_match_and_deletes_are_unindexed(self):
+        from apps.blog.models import Article, ArticleTranslation
+        from apps.core.search import search_posts
+
+        in_content = Article.objects.create(title="Tickets", slug="tickets")
+        ArticleTranslation.objects.create(
+            translatable_content=in_content,
+            language="en",
+            title="Service tickets",
+            content="Kerberoasting is one way to abuse them.",
+        )
+        in_title = Article.objects.create(title="Kerberos", slug="kerberos")
+        translation = ArticleTranslation.objects.create(
+            translatable_content=in_title,
+            language="en",
+            title="Kerberoasting",
+            content="Offline cracking.",
+        )
+        hits = search_posts("kerberoasting", "en").hits
+        assert [hit.post for hit in hits] == [in_title, in_content]
+
+        translation.delete()
+        assert [hit.post for hit in search_posts("kerberoasting", "en").hits] == [in_content]
+
+    def test_results_are_paginated_across_types_with_facets(self):
+        from apps.blog.models import Article, ArticleTranslation
+        from apps.core.search import search_posts
+        from apps.infosec.models import Writeup, WriteupTranslation
+
+        for i, visibility in enumerate(["public", "public", "public", "private"]):
+            article = Article.objects.create(title=f"A{i}", slug=f"a{i}", visibility=visibility)
+            ArticleTranslation.objects.create(
+                translatable_content=article, language="en", title=f"Kerberoasting {i}", content="..."
+            )
+        writeup = Writeup.objects.create(title="W", slug="w")
+        WriteupTranslation.objects.create(
+            translatable_content=writeup, language="en", title="Kerberoasting", content=""
+        )
+
+        first = search_posts("kerberoasting", "en", limit=2)
+        assert first.facets == {"articles": 3, "writeups": 1, "lessons": 0}
+        assert first.total == 4
+        assert len(first.hits) == 2
+        assert first.has_next
+
+        second = search_posts("kerberoasting", "en", limit=2, after=first.next_cursor)
+        by_offset = search_posts("kerberoasting", "en", limit=2, offset=2)
+        assert [(h.kind, h.translation.pk) for h in second.hits] == [(h.kind, h.translation.pk) for h in by_offset.hits]
+        assert len({(h.kind, h.translation.pk) for h in first.hits + second.hits}) == 4
+        assert not second.has_next
+
+        writeups = search_posts("kerberoasting", "en", kind="writeups")
+        assert [h.post for h in writeups.hits] == [writeup]
+        assert writeups.total == 1
+
+    def test_search_page_past_the_end_shows_the_last_one(self):
+        from apps.blog.models import Article, ArticleTranslation
+
+        for i in range(3):
+            article = Article.objects.create(title=f"A{i}", slug=f"a{i}")
+            ArticleTranslation.objects.create(
+                translatable_content=article, language="fr", title=f"Kerberos {i}", content=""
+            )
+        with self.settings(POSTS_PER_PAGE=2):
+            response = self.client.get(reverse("core:search"), {"q": "kerberos", "page": "1" + "0" * 24})
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["page"] == 2
+        assert len(response.context["results"].hits) == 1
+
+    def test_result_pages_are_cached_until_content_changes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from apps.blog.models import Article, ArticleTranslation
+        from apps.core.search import search_posts
+
+        article = Article.objects.create(title="XSS", slug="xss")
+        ArticleTranslation.objects.create(translatable_content=article, language="en", title="Stored XSS", content="")
+        assert len(search_posts("xss", "en").hits) == 1
+
+        with CaptureQueriesContext(connection) as queries:
+            assert len(search_posts("  XSS ", "en").hits) == 1
+        assert not any("UNION ALL" in q["sql"] for q in queries.captured_queries)
+
+        other = Article.objects.create(title="DOM XSS", slug="dom-xss")
+        ArticleTranslation.objects.create(translatable_content=other, language="en", title="DOM XSS", content="")
+        assert len(search_posts("xss", "en").hits) == 2
+        other.visibility = "private"
+        other.save()
+        assert [h.post for h in search_posts("xss", "en").hits] == [article]
+
+    def test_hits_carry_escaped_highlighted_snippets_without_loading_content(self):
+        from apps.blog.models import Article, ArticleTranslation
+        from apps.core.search import search_posts
+
+        article = Article.objects.create(title="Relay", slug="relay")
+        ArticleTranslation.objects.create(
+            translatable_content=article,
+            language="en",
+            title="NTLM relay",
+            content="Coerce <b>authentication</b> then relay it to LDAP for a shadow credential.",
+        )
+        hit = search_posts("relay", "en").hits[0]
+        assert "<mark>relay</mark>" in hit.snippet
+        assert "<b>" not in hit.snippet  # escaped (FTS5) or dropped (ts_headline)
+        assert "content" in hit.translation.get_deferred_fields()
+
+    def test_bench_search_reports_relevance_on_seeded_corpus(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from apps.blog.models import Article
+
+        out = StringIO()
+        call_command("bench_search", posts=2, runs=1, stdout=out)
+        overall = out.getvalue().splitlines()[-1].split()
+        assert overall[0] == "overall"
+        assert float(overall[-2]) > 0.5  # MRR: judged documents are found
+        assert not Article.objects.filter(slug__startswith="bench-").exists()  # rolled back
+
+    def test_autocomplete_completes_word_starts_of_public_titles(self):
+        from apps.blog.models import Article, ArticleTranslation
+
+        for slug, title, visibility in [
+            ("kerberoasting", "Kerberoasting explained", "public"),
+            ("golden", "Golden tickets with Kerberos", "public"),
+            ("draft", "Kerberos draft", "private"),
+        ]:
+            article = Article.objects.create(title=title, slug=slug, visibility=visibility)
+            ArticleTranslation.objects.create(translatable_content=article, language="fr", title=title, content="")
+
+        response = self.client.get(reverse("core:search_autocomplete"), {"q": "KERB"})
+        assert [r["title"] for r in response.json()["results"]] == [
+            "Kerberoasting explained",
+            "Golden tickets with Kerberos",
+        ]
+        response = self.client.get(reverse("core:search_autocomplete"), {"q": "expl"})
+        assert response.json()["results"][0]["url"] == Article.objects.get(slug="kerberoasting").get_absolute_url()
+
+    def test_no_hits_suggests_close_public_terms(self):
+        from apps.blog.models import Article, ArticleTag
+        from apps.infosec.models import CVE
+
+        Article.objects.create(title="Kerberos", slug="kerberos").tags.add(ArticleTag.objects.create(title="Kerberos"))
+        CVE.objects.create(cve_id="CVE-2021-44228")
+        CVE.objects.create(cve_id="CVE-2021-44229", visibility="private")
+
+        response = self.client.get(reverse("core:search"), {"q": "kerbros"})
+        assert response.context["suggestions"] == ["Kerberos"]
+        response = self.client.get(reverse("core:search"), {"q": "CVE-2021-4428"})
+        assert response.context["suggestions"] == ["CVE-2021-44228"]
+
+    def test_word_matches_suggest_the_word_once_behind_the_exact_tag(self):
+        from apps.blog.models import Article, ArticleTag, ArticleTranslation
+
+        ArticleTag.objects.create(title="Kerberos")
+        for i in range(6):
+            article = Article.objects.create(title=f"Box {i}", slug=f"box-{i}")
+            ArticleTranslation.objects.create(
+                translatable_content=article, language="fr", title=f"HTB box {i} kerberos", content=""
+            )
+
+        response = self.client.get(reverse("core:search"), {"q": "kerbros"})
+        assert response.context["suggestions"] == ["Kerberos"]
+
+
+class TagDetailTests(TestCase):
+    def test_tag_page_merges_article_and_writeup_tags_by_slug(self):
+        from apps.blog.models import Article, ArticleTag
+        from apps.infosec.models import Writeup, WriteupTag
+
+        article = Article.objects.create(title="A", slug="a")
+        article.tags.add(ArticleTag.objects.create(title="Active Directory"))
+        writeup = Writeup.objects.create(title="W", slug="w")
+        writeup.tags.add(WriteupTag.objects.create(title="active directory"))
+        Article.objects.create(title="P", slug="p", visibility="private").tags.add(ArticleTag.objects.get())
+
+        response = self.client.get(reverse("core:tag_detail", args=["active-directory"]))
+        assert response.context["tag_title"] == "Active Directory"
+        assert response.context["articles"] == [article]
+        assert response.context["writeups"] == [writeup]
+        assert response.context["total"] == 2
+        assert self.client.get(reverse("core:tag_detail", args=["nope"])).status_code == HTTPStatus.NOT_FOUND
+
+    def test_undated_posts_come_first_like_the_lists(self):
+        from apps.blog.models import Article, ArticleTag
+        from apps.core.tags import tagged_posts
+
+        tag = ArticleTag.objects.create(title="Kerberos")
+        dated, undated = (Article.objects.create(title=t, slug=t) for t in ("dated", "undated"))
+        Article.objects.filter(pk=undated.pk).update(published_on=None)
+        for article in (dated, undated):
+            article.tags.add(tag)
+        posts, total = tagged_posts("kerberos", limit=1)
+        assert (posts["articles"], total) == ([undated], 2)
+
+    def test_tag_counts_follow_posts_and_feed_the_cloud(self):
+        from apps.blog.models import Article, ArticleTag
+        from apps.infosec.models import Writeup, WriteupTag
+
+        tag = ArticleTag.objects.create(title="Kerberos")
+        article = Article.objects.create(title="A", slug="a")
+        article.tags.add(tag)
+        Writeup.objects.create(title="W", slug="w").tags.add(WriteupTag.objects.create(title="kerberos"))
+        tag.refresh_from_db()
+        assert tag.post_count == 1
+
+        response = self.client.get(reverse("core:tag_list"))
+        assert response.context["tags"] == [{"slug": "kerberos", "title": "Kerberos", "count": 2, "size": 5}]
+
+        article.visibility = "private"
+        article.save()
+        tag.refresh_from_db()
+        assert tag.post_count == 0
+        assert self.client.get(reverse("core:tag_list")).context["tags"][0]["count"] == 1
+
+    def test_non_latin_tags_get_a_page_and_slugless_ones_are_skipped(self):
+        from apps.blog.models import Article, ArticleTag
+
+        article = Article.objects.create(title="A", slug="a")
+        article.tags.add(ArticleTag.objects.create(title="日本"), ArticleTag.objects.create(title="!!!"))
+
+        response = self.client.get(reverse("core:tag_list"))
+        assert response.status_code == HTTPStatus.OK
+        assert [tag["slug"] for tag in response.context["tags"]] == ["日本"]
+        response = self.client.get(reverse("core:tag_detail", args=["日本"]))
+        assert response.context["articles"] == [article]
+
+    def test_only_the_changed_tags_are_recounted(self):
+        from apps.blog.models import Article, ArticleTag
+
+        tag, other = ArticleTag.objects.create(title="Kerberos"), ArticleTag.objects.create(title="NTLM")
+        ArticleTag.objects.filter(pk=other.pk).update(post_count=99)  # stale, must stay so
+        article = Article.objects.create(title="A", slug="a")
+        article.tags.add(tag)
+        article.save()
+        assert dict(ArticleTag.objects.values_list("title", "post_count")) == {"Kerberos": 1, "NTLM": 99}
+
+        article.tags.clear()
+        assert ArticleTag.objects.get(pk=tag.pk).post_count == 0
+        tag.posts.add(article)
+        assert ArticleTag.objects.get(pk=tag.pk).post_count == 1
+        article.delete()
+        assert dict(ArticleTag.objects.values_list("title", "post_count")) == {"Kerberos": 0, "NTLM": 99}
+
+
+class RelatedPostTests(TestCase):
+    def test_lists_follow_tags_across_types_and_visibility(self):
+        from apps.blog.models import Article, ArticleTag
+        from apps.core import related
+        from apps.core.models import InfosecSettings
+        from apps.infosec.models import Writeup, WriteupTag
+
+        InfosecSettings.objects.update(is_active=True)
+        kerberos, smb = ArticleTag.objects.create(title="Kerberos"), ArticleTag.objects.create(title="SMB")
+        with self.captureOnCommitCallbacks(execute=True):
+            source = Article.objects.create(title="Source", slug="source")
+            source.tags.add(kerberos, smb)
+            close = Writeup.objects.create(title="Close", slug="close")
+            close.tags.add(WriteupTag.objects.create(title="kerberos"), WriteupTag.objects.create(title="smb"))
+            partial = Article.objects.create(title="Partial", slug="partial")
+            partial.tags.add(kerberos)
+            Article.objects.create(title="Unrelated", slug="unrelated")
+        assert related.related_posts(source)[:2] == [close, partial]
+        assert len(related.related_posts(source)) == 3
+        InfosecSettings.objects.update(activate_writeups_page=False)
+        assert close not in related.related_posts(source)  # its page would 404
+        InfosecSettings.objects.update(activate_writeups_page=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            close.visibility = "private"
+            close.save()
+        assert close not in related.related_posts(source)
+        assert related.related_posts(source)[0] == partial
+
+        with self.captureOnCommitCallbacks(execute=True):
+            partial.delete()
+        assert [post.slug for post in related.related_posts(source)] == ["unrelated"]
+        assert related.rebuild() == 3
+        assert [post.slug for post in related.related_posts(source)] == ["unrelated"]
+
+    def test_incremental_refresh_matches_a_full_rebuild(self):
+        import datetime as dt
+
+        from apps.blog.models import Article, ArticleTag, Category
+        from apps.core import related
+        from apps.core.models import RelatedPost
+        from apps.infosec.models import Writeup, WriteupTag
+
+        def lists():
+            return sorted(RelatedPost.objects.values_list("source_type_id", "source_id", "rank", "article", "writeup"))
+
+        tags = [ArticleTag.objects.create(title=t) for t in ("Kerberos", "SMB", "LDAP")]
+        writeup_tags = [WriteupTag.objects.create(title=t) for t in ("kerberos", "smb", "ldap")]
+        category = Category.objects.create(title="AD")
+        start = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+        with self.captureOnCommitCallbacks(execute=True):
+            posts = []
+            for i in range(12):
+                model, pool = (Article, tags) if i % 2 else (Writeup, writeup_tags)
+                extra = {"category": category} if model is Article and i % 3 == 0 else {}
+                post = model.objects.create(
+                    title=f"P{i}", slug=f"p{i}", published_on=start + dt.timedelta(days=i), **extra
+                )
+                post.tags.add(*pool[: i % 4])
+                posts.append(post)
+            posts[3].visibility = "private"
+            posts[3].save()
+            posts[5].tags.clear()
+            posts[7].delete()
+        incremental = lists()
+        related.rebuild()
+        assert incremental == lists()
+
+
+class ListTests(TestCase):
+    def test_cursor_links_walk_the_cve_list_both_ways(self):
+        import datetime as dt
+
+        from apps.core.models import InfosecSettings
+        from apps.infosec.models import CVE
+
+        InfosecSettings.objects.update(is_active=True)
+        day = dt.date(2024, 1, 1)
+        CVE.objects.create(cve_id="CVE-2024-0000", description="undated")
+        for i in range(1, 6):
+            CVE.objects.create(cve_id=f"CVE-2024-000{i}", description="x", published_date=day)
+        url = reverse("infosec:cve_list")
+
+        with self.settings(POSTS_PER_PAGE=2):
+            page = self.client.get(url).context["page_obj"]
+            pages = [[c.cve_id for c in page]]
+            while page.has_next():
+                page = self.client.get(url, {"page": page.next_page_number(), "after": page.next_token})
+                page = page.context["page_obj"]
+                pages.append([c.cve_id for c in page])
+            assert pages == [
+                ["CVE-2024-0000", "CVE-2024-0005"],
+                ["CVE-2024-0004", "CVE-2024-0003"],
+                ["CVE-2024-0002", "CVE-2024-0001"],
+            ]
+            back = self.client.get(url, {"page": 2, "before": page.previous_token}).context["page_obj"]
+            assert [c.cve_id for c in back] == pages[1]
+            assert back.number == 2
+            assert [c.cve_id for c in self.client.get(url, {"page": 3}).context["page_obj"]] == pages[2]
+            assert self.client.get(url, {"page": 9}).context["page_obj"].number == 3
+            huge = self.client.get(url, {"page": "1" + "0" * 24})  # would overflow an OFFSET
+            assert [c.cve_id for c in huge.context["page_obj"]] == pages[2]
+
+    def test_small_archive_is_grouped_from_the_cached_year_buckets(self):
+        import datetime as dt
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from apps.blog.models import Article
+        from apps.core.models import BlogSettings
+
+        BlogSettings.objects.update(is_active=True, activate_articles_page=True)
+        old = Article.objects.create(title="Old", slug="old", published_on=dt.datetime(2023, 5, 1, tzinfo=dt.UTC))
+        new = Article.objects.create(title="New", slug="new", published_on=dt.datetime(2024, 5, 1, tzinfo=dt.UTC))
+        url = reverse("blog:article_list")
+
+        groups = self.client.get(url).context["article_groups"]
+        assert [(g["year"], g["items"]) for g in groups] == [(2024, [new]), (2023, [old])]
+        with CaptureQueriesContext(connection) as warm:
+            self.client.get(url)
+        assert not any("COUNT(" in q["sql"] for q in warm.captured_queries)
+
+        old.visibility = "private"
+        old.save()
+        assert self.client.get(url).context["articles"] == [new]
+
+    def test_category_summary_counts_public_posts_and_follows_translations(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from apps.blog.models import Article, Category, CategoryTranslation
+        from apps.core.listings import CategorySummary, category_summary
+
+        web = Category.objects.create(title="Web", slug="web")
+        CategoryTranslation.objects.create(category=web, language="fr", title="Web (fr)")
+        Article.objects.create(title="A", slug="a", category=web)
+        Article.objects.create(title="B", slug="b", category=web, visibility="private")
+
+        assert category_summary(Article, "fr") == [CategorySummary(web.pk, "web", "Web (fr)", 1)]
+        with CaptureQueriesContext(connection) as warm:
+            category_summary(Article, "fr")
+        assert all("django_cache" in q["sql"] for q in warm.captured_queries)
+        CategoryTranslation.objects.filter(category=web).get().delete()
+        assert category_summary(Article, "fr")[0].title == "Web"
+
+    def test_card_fragments_continue_the_list_without_the_page_shell(self):
+        from apps.core.models import InfosecSettings
+        from apps.infosec.models import CVE
+
+        InfosecSettings.objects.update(is_active=True)
+        for i in range(5):
+            CVE.objects.create(cve_id=f"CVE-2024-100{i}", description="x")
+
+        with self.settings(POSTS_PER_PAGE=2):
+            first = self.client.get(reverse("infosec:cve_list")).context["page_obj"]
+            assert first.next_fragment_url.startswith(reverse("infosec:cve_cards"))
+            response = self.client.get(first.next_fragment_url)
+        html = response.content.decode()
+        assert "<html" not in html
+        assert html.count('class="article_card"') == 2
+        assert "CVE-2024-1002" in html
+        assert f'href="{reverse("infosec:cve_list")}?page=3&amp;after=' in html
+        assert "data-fragment-url" in html
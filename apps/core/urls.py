@@ -1,12 +1,15 @@
-from django.urls import path
+from django.urls import path, re_path
 
-from .views import index, page_detail, search_view, tag_detail, well_known
+from .views import index, page_detail, search_autocomplete, search_view, tag_detail, tag_list, well_known
 
 app_name = "core"
 urlpatterns = [
     path("", index, name="index"),
     path("search/", search_view, name="search"),
-    path("tags/<slug:slug>/", tag_detail, name="tag_detail"),
+    path("search/autocomplete/", search_autocomplete, name="search_autocomplete"),
+    path("tags/", tag_list, name="tag_list"),
+    # Tag slugs keep Unicode letters, which the ``slug`` converter rejects.
+    re_path(r"^tags/(?P<slug>[-\w]+)/$", tag_detail, name="tag_detail"),
     path("pages/<slug:slug>/", page_detail, name="page_detail"),
     path(".well-known/<str:filename>", well_known, name="well_known"),
 ]
@@ -1,14 +1,17 @@
+from functools import partial
+
 from django.conf import settings
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.db.models import Count, Q
 from django.http import (
     HttpResponse,
     HttpResponsePermanentRedirect,
     HttpResponseRedirect,
+    JsonResponse,
 )
 from django.shortcuts import Http404, get_object_or_404, render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import translation
+from django.utils.cache import patch_cache_control
 from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
@@ -36,26 +39,37 @@ def resolve_per_page(request):
     return settings.POSTS_PER_PAGE
 
 
-def paginate_queryset(request, queryset, per_page=None):
-    """
-    Paginate ``queryset`` using the ``page`` and ``per_page`` GET parameters.
+# Highest ``?page=`` read as such: any real list is far shorter, and a larger
+# number could overflow the database's integer type once turned into an OFFSET.
+MAX_PAGE = 100_000
 
-    Out-of-range pages clamp to first/last; a non-integer page falls back to 1.
-    ``per_page`` is read from ``?per_page=`` when not provided explicitly and is
-    validated against ``settings.POSTS_PER_PAGE_CHOICES``.
 
-    Returns a ``django.core.paginator.Page`` ready to iterate in templates.
+def resolve_page(request):
+    """
+    Read ``?page=N`` from the request, at least 1 and at most ``MAX_PAGE``;
+    anything unreadable means page 1. A page past the end is the caller's to
+    bring back to the last one.
     """
-    if per_page is None:
-        per_page = resolve_per_page(request)
-    paginator = Paginator(queryset, per_page)
-    page_number = request.GET.get("page")
     try:
-        return paginator.page(page_number)
-    except PageNotAnInteger:
-        return paginator.page(1)
-    except EmptyPage:
-        return paginator.page(paginator.num_pages)
+        return min(max(int(request.GET.get("page", 1)), 1), MAX_PAGE)
+    except (TypeError, ValueError):
+        return 1
+
+
+def render_cards(request, queryset, field, card, page_path, **fragment_params):
+    """The next keyset page of ``queryset`` as bare cards plus its pagination.
+
+    Backs the list pages' infinite scroll: rendered without the request, so
+    no base template and no context processors. ``card`` picks the card
+    template (``article``, ``writeup`` or ``cve``); the pagination links point
+    at ``page_path`` so they still work once inserted into the full page.
+    """
+    from apps.core.pagination import link_pages, paginate_keyset
+
+    page_obj = link_pages(
+        paginate_keyset(request, queryset, field), request, page_path, request.path, **fragment_params
+    )
+    return HttpResponse(render_to_string("components/card_batch.html", {"page_obj": page_obj, "card": card}))
 
 
 def group_by_year(queryset, date_field="published_on"):
@@ -101,58 +115,39 @@ def page_detail(request, slug):
     return render(request, "core/page.html", {"page": page})
 
 
-def tag_detail(request, slug):
-    """List every public article + writeup whose tag title slugifies to slug.
+def tag_list(request):
+    """Tag cloud of every tag carrying public articles or writeups."""
+    from apps.core.tags import tag_cloud
 
-    Article and writeup tags are stored as separate models with no
-    explicit slug field. We compare slugify(tag.title) to the URL slug
-    on the fly so the same `[kerberos]` tag in articles and writeups
-    lands on the same page.
-    """
-    from django.utils.text import slugify
+    return render(request, "core/tag_list.html", {"tags": tag_cloud()})
 
-    from apps.blog.models import ArticleTag
-    from apps.infosec.models import WriteupTag
 
-    titles = set()
-    for Tag in (ArticleTag, WriteupTag):
-        for t in Tag.objects.all():
-            if slugify(t.title) == slug:
-                titles.add(t.title)
+def tag_detail(request, slug):
+    """List every public article + writeup carrying a tag with this slug.
+
+    Article and writeup tags are separate models; both store
+    ``slugify(title)`` as ``slug``, so the same ``[kerberos]`` tag in
+    articles and writeups lands on the same page.
+    """
+    from apps.core.tags import display_title, tag_index, tagged_posts
 
+    titles = tag_index().get(slug)
     if not titles:
         raise Http404
 
-    articles = (
-        Article.objects.filter(visibility="public", tags__title__in=titles)
-        .select_related("category")
-        .prefetch_related("translations", "tags")
-        .distinct()
-        .order_by("-published_on")
-    )
-    writeups = (
-        Writeup.objects.filter(visibility="public", tags__title__in=titles)
-        .select_related("category")
-        .prefetch_related("translations", "tags")
-        .distinct()
-        .order_by("-published_on")
-    )
-
-    if not (articles.exists() or writeups.exists()):
+    posts, total = tagged_posts(slug)
+    if not total:
         raise Http404
 
-    # Pick the canonical display title (longest, prefer with capitals).
-    display_title = sorted(titles, key=lambda t: (-len(t), t))[0]
-
     return render(
         request,
         "core/tag_detail.html",
         {
-            "tag_title": display_title,
+            "tag_title": display_title(titles),
             "tag_slug": slug,
-            "articles": articles,
-            "writeups": writeups,
-            "total": articles.count() + writeups.count(),
+            "articles": posts["articles"],
+            "writeups": posts["writeups"],
+            "total": total,
         },
     )
 
@@ -258,12 +253,27 @@ def verify_2fa_view(request):
 
 
 def search_view(request):
-    """Cross-app search across translated posts in the active language."""
-    from apps.core.search import search_posts
+    """Cross-app search across translated posts in the active language.
+
+    ``?type=`` narrows to one post type, ``?page=`` picks a page by offset (a
+    page past the end shows the last one) and ``?after=`` (the "Next" link)
+    continues from the previous page's keyset cursor instead.
+    """
+    from apps.core.search import search_posts, suggest
 
     query = request.GET.get("q", "").strip()
-    results = search_posts(query, get_language()) if query else None
-    total = sum(len(v) for v in results.values()) if results else 0
+    per_page = resolve_per_page(request)
+    page = resolve_page(request)
+    results = None
+    if query:
+        search = partial(search_posts, query, get_language(), kind=request.GET.get("type"), limit=per_page)
+        results = search(offset=(page - 1) * per_page, after=request.GET.get("after"))
+        if not results.hits and results.total and page > 1:
+            # Past the end, like the lists: fall back to the last page.
+            page = -(-results.total // per_page)
+            results = search(offset=(page - 1) * per_page)
+    total = results.total if results else 0
+    suggestions = suggest(query, get_language()) if query and not total else []
     return render(
         request,
         "core/search.html",
@@ -271,10 +281,26 @@ def search_view(request):
             "query": query,
             "results": results,
             "total": total,
+            "page": page,
+            "num_pages": -(-total // per_page),
+            "suggestions": suggestions,
         },
     )
 
 
+def search_autocomplete(request):
+    """Title completions for ``?q=`` in the active language, as JSON.
+
+    Answered from ``apps.core.autocomplete``'s in-memory index; browsers may
+    reuse an answer for a minute, which absorbs repeated keystrokes.
+    """
+    from apps.core.autocomplete import complete
+
+    response = JsonResponse({"results": complete(request.GET.get("q", ""), get_language())})
+    patch_cache_control(response, public=True, max_age=60)
+    return response
+
+
 def redirect_to_available_translation(post, url_name, url_args):
     """
     If the active language has no translation for ``post``, return a 301 to
@@ -366,17 +392,14 @@ def posts_list(
     Returns:
         HttpResponse: Rendered posts list page.
     """
+    from apps.core.listings import category_summary
+
     posts = post_model.objects.filter(visibility="public").prefetch_related("translations", "tags")
     selected_category = None
     if slug:
         selected_category = get_object_or_404(category_model, slug=slug)
         posts = posts.filter(category=selected_category)
-    category_field = post_model._meta.get_field("category")
-    related_name = category_field.remote_field.related_name
-
-    categories = category_model.objects.annotate(
-        num_posts=Count(related_name, filter=Q(**{f"{related_name}__visibility": "public"}))
-    ).filter(num_posts__gt=0)
+    categories = category_summary(post_model)
 
     return render(
         request,
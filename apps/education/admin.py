@@ -66,7 +66,6 @@ class CourseAdmin(PageViewsAdminMixin, ModelAdmin):
 
     def get_queryset(self, request):
         return ModelAdmin.get_queryset(self, request).annotate(
-            _views=Count("page_views", distinct=True),
             _modules=Count("modules", distinct=True),
             _lessons=Count("modules__lessons", distinct=True),
         )
@@ -0,0 +1,66 @@
+# Generated by Django 6.0.4 on 2026-10-19 14:47
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def backfill_view_counts(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    PageView = apps.get_model("analytics", "PageView")
+    since = timezone.now() - timedelta(days=30)
+    for name in ("course", "lesson", "module"):
+        ct = ContentType.objects.filter(app_label="education", model=name).first()
+        if ct is None:
+            continue
+        views = PageView.objects.filter(content_type_id=ct.pk, object_id=OuterRef("pk")).order_by().values("object_id")
+        apps.get_model("education", name).objects.update(
+            view_count=Coalesce(Subquery(views.annotate(n=Count("id")).values("n")), 0),
+            views_30d=Coalesce(Subquery(views.filter(created_at__gte=since).annotate(n=Count("id")).values("n")), 0),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("education", "0004_alter_course_category_alter_lesson_order_and_more"),
+        ("analytics", "0005_remove_pageview_path_and_more"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="view_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Views"),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="views_30d",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Views (30 days)"),
+        ),
+        migrations.AddField(
+            model_name="lesson",
+            name="view_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Views"),
+        ),
+        migrations.AddField(
+            model_name="lesson",
+            name="views_30d",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Views (30 days)"),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="view_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Views"),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="views_30d",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Views (30 days)"),
+        ),
+        migrations.RunPython(backfill_view_counts, migrations.RunPython.noop),
+    ]
@@ -42,6 +42,8 @@ class Course(models.Model):
     slug = models.SlugField()
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="courses")
     page_views = GenericRelation("analytics.PageView")
+    view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Views"))
+    views_30d = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Views (30 days)"))
 
     def save(self, *args, **kwargs):
         if not self.category_id:
@@ -79,6 +81,8 @@ class Module(models.Model):
     order = models.PositiveIntegerField(default=0, db_index=True)
     slug = models.SlugField()
     page_views = GenericRelation("analytics.PageView")
+    view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Views"))
+    views_30d = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Views (30 days)"))
 
     def __str__(self):
         """Return the module title as its string representation"""
@@ -131,6 +135,8 @@ class Lesson(AbstractTranslatableMarkdownItem):
         verbose_name=_("Visibility"),
     )
     page_views = GenericRelation("analytics.PageView")
+    view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Views"))
+    views_30d = models.PositiveIntegerField(default=0, editable=False, verbose_name=_("Views (30 days)"))
 
     def __str__(self):
         """Return the lesson title as its string representation"""
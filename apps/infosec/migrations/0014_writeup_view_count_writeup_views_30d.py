@@ -0,0 +1,46 @@
+# Generated by Django 6.0.4 on 2026-10-19 14:47
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def backfill_view_counts(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    PageView = apps.get_model("analytics", "PageView")
+    since = timezone.now() - timedelta(days=30)
+    for name in ("writeup",):
+        ct = ContentType.objects.filter(app_label="infosec", model=name).first()
+        if ct is None:
+            continue
+        views = PageView.objects.filter(content_type_id=ct.pk, object_id=OuterRef("pk")).order_by().values("object_id")
+        apps.get_model("infosec", name).objects.update(
+            view_count=Coalesce(Subquery(views.annotate(n=Count("id")).values("n")), 0),
+            views_30d=Coalesce(Subquery(views.filter(created_at__gte=since).annotate(n=Count("id")).values("n")), 0),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("infosec", "0013_alter_ctf_date_beginning_alter_ctf_date_end"),
+        ("analytics", "0005_remove_pageview_path_and_more"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="writeup",
+            name="view_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Views"),
+        ),
+        migrations.AddField(
+            model_name="writeup",
+            name="views_30d",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Views (30 days)"),
+        ),
+        migrations.RunPython(backfill_view_counts, migrations.RunPython.noop),
+    ]
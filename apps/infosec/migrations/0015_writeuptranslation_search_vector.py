@@ -0,0 +1,82 @@
+# Generated by Django 6.0.4 on 2026-10-19 15:20
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+INDEX = "infosec_writeuptranslation_search_gin"
+
+# apps.core.search.PG_TEXT_SEARCH_CONFIG when this migration was written:
+# migrations must not import live code.
+PG_TEXT_SEARCH_CONFIG = {
+    "ar": "arabic",
+    "ca": "catalan",
+    "da": "danish",
+    "de": "german",
+    "el": "greek",
+    "en": "english",
+    "es": "spanish",
+    "eu": "basque",
+    "fi": "finnish",
+    "fr": "french",
+    "ga": "irish",
+    "hi": "hindi",
+    "hu": "hungarian",
+    "hy": "armenian",
+    "id": "indonesian",
+    "it": "italian",
+    "lt": "lithuanian",
+    "ne": "nepali",
+    "nl": "dutch",
+    "no": "norwegian",
+    "pt": "portuguese",
+    "ro": "romanian",
+    "ru": "russian",
+    "sr": "serbian",
+    "sv": "swedish",
+    "ta": "tamil",
+    "tr": "turkish",
+    "yi": "yiddish",
+}
+
+
+def weighted_vector(config):
+    """title (A) > description (B) > content (C), as ``apps.core.search`` stores it."""
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector("description", weight="B", config=config)
+        + SearchVector("content", weight="C", config=config)
+    )
+
+
+def index_search_vector(apps, schema_editor):
+    """Backfill the stored vectors and GIN-index them (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Translation = apps.get_model("infosec", "WriteupTranslation")
+    languages = Translation.objects.values_list("language", flat=True).distinct().order_by()
+    for language in list(languages):
+        config = PG_TEXT_SEARCH_CONFIG.get(language, "simple")
+        Translation.objects.filter(language=language).update(search_vector=weighted_vector(config))
+    schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {INDEX} ON infosec_writeuptranslation USING gin (search_vector)")
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("infosec", "0014_writeup_view_count_writeup_views_30d"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="writeuptranslation",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(index_search_vector, drop_index),
+    ]
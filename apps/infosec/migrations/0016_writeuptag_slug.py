@@ -0,0 +1,29 @@
+# Generated by Django 6.0.4 on 2026-10-19 17:30
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    WriteupTag = apps.get_model("infosec", "WriteupTag")
+    tags = list(WriteupTag.objects.all())
+    for tag in tags:
+        tag.slug = slugify(tag.title)
+    WriteupTag.objects.bulk_update(tags, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("infosec", "0015_writeuptranslation_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="writeuptag",
+            name="slug",
+            field=models.SlugField(default="", editable=False, max_length=255, verbose_name="Slug"),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+    ]
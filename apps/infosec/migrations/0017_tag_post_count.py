@@ -0,0 +1,25 @@
+# Generated by Django 6.0.4 on 2026-10-19 18:10
+
+from django.db import migrations, models
+
+
+def count_posts(apps, schema_editor):
+    from apps.core.tags import refresh_counts
+
+    refresh_counts(apps.get_model("infosec", "WriteupTag"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("infosec", "0016_writeuptag_slug"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="writeuptag",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Posts"),
+        ),
+        migrations.RunPython(count_posts, migrations.RunPython.noop),
+    ]
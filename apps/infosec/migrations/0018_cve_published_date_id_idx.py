@@ -0,0 +1,19 @@
+# Generated by Django 6.0.4 on 2026-10-19 18:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("infosec", "0017_tag_post_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cve",
+            index=models.Index(fields=["-published_date", "-id"], name="infosec_cve_publish_528cb2_idx"),
+        ),
+    ]
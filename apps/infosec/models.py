@@ -198,6 +198,10 @@ class CVE(models.Model):
         """Return the cve id as its string representation"""
         return self.cve_id
 
+    class Meta:
+        # Serves cve_list's keyset pagination (apps.core.pagination).
+        indexes = [models.Index(fields=["-published_date", "-id"])]
+
 
 class CTF(models.Model):
     """
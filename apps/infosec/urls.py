@@ -2,7 +2,9 @@ from django.urls import path
 
 from .views import (
     certification_list,
+    cve_cards,
     cve_list,
+    writeup_cards,
     writeup_detail,
     writeup_list,
 )
@@ -18,4 +20,6 @@ urlpatterns = [
     path("writeups/", writeup_list, name="writeup_list"),
     path("certifications/", certification_list, name="certification_list"),
     path("cves/", cve_list, name="cve_list"),
+    path("fragments/writeups/", writeup_cards, name="writeup_cards"),
+    path("fragments/cves/", cve_cards, name="cve_cards"),
 ]
@@ -1,7 +1,11 @@
 from django.shortcuts import Http404, get_object_or_404, render
+from django.urls import reverse
 
 from apps.core.decorators import feature_active_required
-from apps.core.views import group_by_year, paginate_queryset, redirect_to_available_translation
+from apps.core.listings import category_summary, post_archive
+from apps.core.pagination import link_pages, paginate_keyset
+from apps.core.related import related_posts
+from apps.core.views import group_by_year, redirect_to_available_translation, render_cards
 
 from .models import CTF, CVE, Category, Certification, Writeup
 
@@ -31,26 +35,11 @@ def writeup_detail(request, slug_category, slug_writeup):
     if redirect_response is not None:
         return redirect_response
 
-    related = list(
-        Writeup.objects.filter(visibility="public", category=category)
-        .exclude(pk=writeup.pk)
-        .select_related("category")
-        .order_by("-published_on")[:4]
-    )
-    if len(related) < 4:
-        seen = {w.pk for w in related} | {writeup.pk}
-        fill = (
-            Writeup.objects.filter(visibility="public")
-            .exclude(pk__in=seen)
-            .select_related("category")
-            .order_by("-published_on")[: 4 - len(related)]
-        )
-        related += list(fill)
+    related = related_posts(writeup)
 
     context = {
         "writeup": writeup,
         "related_posts": related,
-        "related_post_url_name": "infosec:writeup_detail",
     }
 
     if writeup.visibility == "protected":
@@ -87,15 +76,17 @@ def writeup_list(request, slug=None):
 
     ctfs = CTF.objects.all()
 
-    categories = Category.objects.filter(writeups__isnull=False, writeups__visibility="public").distinct()
+    categories = category_summary(Writeup)
 
     GROUP_THRESHOLD = 40
-    total = writeups.count()
-    if total <= GROUP_THRESHOLD:
+    archive = post_archive(writeups.model, selected_category)
+    if archive.count <= GROUP_THRESHOLD:
         page_obj = None
-        groups = group_by_year(writeups)
+        groups = archive.groups(writeups)
+        writeups = [post for group in groups for post in group["items"]]
     else:
-        page_obj = paginate_queryset(request, writeups)
+        page_obj = paginate_keyset(request, writeups, "published_on")
+        link_pages(page_obj, request, fragment_path=reverse("infosec:writeup_cards"), category=slug)
         groups = group_by_year(page_obj.object_list)
 
     return render(
@@ -138,6 +129,45 @@ def cve_list(request):
     Returns:
         HttpResponse: The rendered cve list page.
     """
-    cves = CVE.objects.order_by("-published_date", "-id")
-    page_obj = paginate_queryset(request, cves)
+    page_obj = paginate_keyset(request, CVE.objects.all(), "published_date")
+    link_pages(page_obj, request, fragment_path=reverse("infosec:cve_cards"))
     return render(request, "infosec/cve_list.html", {"cves": page_obj, "page_obj": page_obj})
+
+
+@feature_active_required(module_name="infosec", feature_name="writeups")
+def writeup_cards(request):
+    """
+    Render the next batch of writeup cards for the list's infinite scroll.
+
+    Args:
+        request (HttpRequest): The HTTP request object; ``?after=`` cursor,
+            optional ``?category=`` slug.
+
+    Returns:
+        HttpResponse: Bare cards followed by the pagination nav.
+    """
+    writeups = (
+        Writeup.objects.filter(visibility="public")
+        .select_related("category", "ctf")
+        .prefetch_related("translations", "tags")
+    )
+    slug = request.GET.get("category")
+    page_path = reverse("infosec:writeup_list")
+    if slug:
+        writeups = writeups.filter(category=get_object_or_404(Category, slug=slug))
+        page_path = reverse("infosec:writeup_category_list", args=[slug])
+    return render_cards(request, writeups, "published_on", "writeup", page_path, category=slug)
+
+
+@feature_active_required(module_name="infosec", feature_name="cves")
+def cve_cards(request):
+    """
+    Render the next batch of CVE cards for the list's infinite scroll.
+
+    Args:
+        request (HttpRequest): The HTTP request object; ``?after=`` cursor.
+
+    Returns:
+        HttpResponse: Bare cards followed by the pagination nav.
+    """
+    return render_cards(request, CVE.objects.all(), "published_date", "cve", reverse("infosec:cve_list"))
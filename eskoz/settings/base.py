@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sitemaps",
+    "django.contrib.postgres",
     "auditlog",
     "apps.core",
     "apps.blog",
@@ -406,6 +407,22 @@ ADMIN_URL = os.getenv("ADMIN_URL") or "admin"
 
 POSTS_PER_PAGE = 12
 POSTS_PER_PAGE_CHOICES = [12, 24, 36]
+# Seconds a search result page (ids and ranks) stays cached; 0 disables.
+# Any translation or post save invalidates every cached page anyway.
+SEARCH_CACHE_TIMEOUT = 10 * 60
+
+# Analytics "Last hour" panel: window length and bar width, in minutes.
+ANALYTICS_REALTIME_MINUTES = 60
+ANALYTICS_REALTIME_BUCKET = 5
+# Live panel: seconds between the dashboard's polls (2 at least).
+ANALYTICS_LIVE_INTERVAL = 5
+# Page-view sampling: share of visitors recorded (1.0 = all), optionally per
+# path prefix (longest match wins), e.g. {"/en/blog/": 0.1}. Counts are
+# scaled back up by each row's weight.
+ANALYTICS_SAMPLE_RATE = 1.0
+ANALYTICS_SAMPLE_RATES = {}
+# Optional DuckDB archive of closed days (archive_pageviews); needs duckdb.
+ANALYTICS_ARCHIVE_DIR = os.getenv("ANALYTICS_ARCHIVE_DIR") or None
 
 EDITOR_PERMISSIONS = {
     "infosec": {
@@ -0,0 +1,100 @@
+/* Live "Last hour" panel on the Analytics admin page.
+ *
+ * Polls `admin:analytics_live` (JSON) every `data-live-interval` seconds
+ * and updates the server-rendered panel in place: headline counts, bar
+ * heights and tooltips, and the top-pages list. The server shares one
+ * aggregate across every open dashboard, so a poll never triggers a query
+ * of its own. Short requests keep open tabs from holding worker threads;
+ * polling pauses while the tab is hidden.
+ */
+(function () {
+    "use strict";
+
+    function setText(root, key, value) {
+        const el = root.querySelector(`[data-live="${key}"]`);
+        if (el) el.textContent = value;
+    }
+
+    function updateSeries(root, series) {
+        const bars = root.querySelectorAll('[data-live="series"] > .bar');
+        if (bars.length !== series.length) return;
+        series.forEach((s, i) => {
+            const bar = bars[i];
+            bar.style.height = `${s.pct}%`;
+            bar.style.minHeight = s.count ? "2px" : "0";
+            const count = bar.querySelector(".bar__tip strong");
+            const label = bar.querySelector(".bar__tip span");
+            if (count) count.textContent = s.count;
+            if (label) label.textContent = s.label;
+        });
+    }
+
+    function updatePages(root, pages) {
+        const list = root.querySelector('[data-live="pages"]');
+        if (!list) return;
+        list.replaceChildren(
+            ...pages.map((p) => {
+                const li = document.createElement("li");
+                li.className = "flex items-center gap-3 py-1.5 text-sm";
+                const link = document.createElement("a");
+                link.href = p.path;
+                link.className = "grow truncate text-primary-600 hover:underline dark:text-primary-500";
+                link.textContent = p.path;
+                const n = document.createElement("span");
+                n.className = "shrink-0 font-medium text-font-default-light dark:text-font-default-dark";
+                n.textContent = p.n;
+                li.append(link, n);
+                return li;
+            }),
+        );
+        list.hidden = pages.length === 0;
+    }
+
+    function init() {
+        const root = document.querySelector("[data-live-url]");
+        if (!root || !window.fetch) return;
+        const status = root.querySelector('[data-live="status"]');
+        const delay = (Number(root.dataset.liveInterval) || 5) * 1000;
+        let timer = null;
+        let polling = false;
+
+        async function poll() {
+            timer = null;
+            polling = true;
+            try {
+                const response = await fetch(root.dataset.liveUrl, {
+                    credentials: "same-origin",
+                    headers: { Accept: "application/json" },
+                });
+                if (!response.ok) throw new Error(response.statusText);
+                const data = await response.json();
+                setText(root, "views", data.views);
+                setText(root, "uniques", data.uniques);
+                setText(root, "peak", data.peak);
+                updateSeries(root, data.series);
+                updatePages(root, data.pages);
+                if (status) status.hidden = false;
+            } catch (_) {
+                if (status) status.hidden = true;
+            }
+            polling = false;
+            if (!document.hidden) timer = setTimeout(poll, delay);
+        }
+
+        document.addEventListener("visibilitychange", () => {
+            if (document.hidden) {
+                clearTimeout(timer);
+                timer = null;
+            } else if (timer === null && !polling) {
+                poll();
+            }
+        });
+        timer = setTimeout(poll, delay);
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", init);
+    } else {
+        init();
+    }
+})();
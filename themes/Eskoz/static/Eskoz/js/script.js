@@ -103,4 +103,112 @@ document.addEventListener('DOMContentLoaded', () => {
       counter.textContent = `${count}/${lessonCards.length}`;
     }
   }
+
+  // Search-as-you-type: title completions under the search box
+  const searchInput = document.querySelector('[data-autocomplete-url]');
+  const suggestions = searchInput && document.getElementById(searchInput.getAttribute('aria-controls'));
+  if (searchInput && suggestions) {
+    let timer = null;
+    let pending = null;
+    let active = -1;
+
+    const options = () => suggestions.querySelectorAll('a');
+    const hide = () => {
+      suggestions.hidden = true;
+      searchInput.setAttribute('aria-expanded', 'false');
+      active = -1;
+    };
+    const highlight = index => {
+      const items = options();
+      items.forEach((item, i) => item.classList.toggle('search-autocomplete--active', i === index));
+      active = index;
+    };
+    const render = results => {
+      suggestions.replaceChildren(...results.map(r => {
+        const li = document.createElement('li');
+        li.setAttribute('role', 'option');
+        const link = document.createElement('a');
+        link.href = r.url;
+        link.textContent = r.title;
+        li.appendChild(link);
+        return li;
+      }));
+      suggestions.hidden = results.length === 0;
+      searchInput.setAttribute('aria-expanded', results.length ? 'true' : 'false');
+      active = -1;
+    };
+
+    searchInput.addEventListener('input', () => {
+      clearTimeout(timer);
+      const q = searchInput.value.trim();
+      if (q.length < 2) { hide(); return; }
+      timer = setTimeout(() => {
+        if (pending) pending.abort();
+        pending = new AbortController();
+        const url = `${searchInput.dataset.autocompleteUrl}?q=${encodeURIComponent(q)}`;
+        fetch(url, { signal: pending.signal, headers: { Accept: 'application/json' } })
+          .then(r => (r.ok ? r.json() : { results: [] }))
+          .then(data => render(data.results))
+          .catch(() => {});
+      }, 120);
+    });
+    searchInput.addEventListener('keydown', e => {
+      const items = options();
+      if (suggestions.hidden || !items.length) return;
+      if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+        e.preventDefault();
+        const step = e.key === 'ArrowDown' ? 1 : -1;
+        highlight((active + step + items.length) % items.length);
+      } else if (e.key === 'Enter' && active >= 0) {
+        e.preventDefault();
+        window.location.href = items[active].href;
+      } else if (e.key === 'Escape') {
+        hide();
+      }
+    });
+    document.addEventListener('click', e => {
+      if (!suggestions.contains(e.target) && e.target !== searchInput) hide();
+    });
+  }
+
+  // Infinite scroll: list pages load the next batch of cards in place.
+  // The pagination nav stays a plain link pager without JS.
+  const pager = document.querySelector('.pagination[data-fragment-url]');
+  if (pager && 'IntersectionObserver' in window) {
+    let current = pager;
+    let loading = false;
+
+    const loadMore = () => {
+      const url = current.dataset.fragmentUrl;
+      if (loading || !url) return;
+      loading = true;
+      fetch(url, { headers: { Accept: 'text/html' } })
+        .then(r => (r.ok ? r.text() : Promise.reject(r.status)))
+        .then(html => {
+          const batch = document.createRange().createContextualFragment(html);
+          const next = batch.querySelector('.pagination');
+          const nextPage = current.querySelector('.pagination--next');
+          if (next) next.remove();
+          current.before(batch);
+          if (nextPage && nextPage.href) {
+            history.replaceState(null, '', nextPage.href);
+          }
+          observer.unobserve(current);
+          if (next) {
+            current.replaceWith(next);
+            current = next;
+            if (next.dataset.fragmentUrl) observer.observe(next);
+          } else {
+            current.remove();
+          }
+        })
+        .catch(() => {})
+        .finally(() => { loading = false; });
+    };
+
+    const observer = new IntersectionObserver(entries => {
+      if (entries.some(entry => entry.isIntersecting)) loadMore();
+    }, { rootMargin: '400px 0px' });
+    observer.observe(pager);
+  }
 });